@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+SENTIMENT_LABELS = ("Very Bad", "Bad", "Moderate", "Good", "Very Good")
+MAX_WORDS = 20  # Word counts above this share the last bucket
+COMPOUND_BINS = np.linspace(-1.0, 1.0, 201)
+WORD_BINS = np.arange(MAX_WORDS + 2) - 0.5  # One bin per whole word count
+
+
+def count_words(text):
+    # Same rule as the old `len(x.split(', ')) if x else 0` without building the list
+    return text.count(', ') + 1 if text else 0
+
+
+def count_words_series(texts):
+    texts = texts.fillna('').astype(str)
+    return texts.str.count(', ') + texts.ne('')
+
+
+class RunningStats:
+    # Count, mean and variance merged batch by batch (Welford/Chan), plus a fixed-bin histogram for quantiles
+    def __init__(self, bins, discrete=False):
+        self.bins = bins
+        self.discrete = discrete  # Whole-number data: quantiles are bin centres, not interpolated
+        self.histogram = np.zeros(len(bins) - 1, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            mean = values.mean()
+            self._merge(values.size, mean, ((values - mean) ** 2).sum())
+            self.histogram += np.histogram(np.clip(values, self.bins[0], self.bins[-1]), self.bins)[0]
+
+    def merge(self, other):
+        if other.count:
+            self._merge(other.count, other.mean, other.m2)
+            self.histogram += other.histogram
+
+    def _merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    def quantile(self, q):
+        if not self.count:
+            return math.nan
+        cumulative = np.cumsum(self.histogram)
+        target = q * self.count
+        index = min(int(np.searchsorted(cumulative, target)), len(self.histogram) - 1)
+        if self.discrete:
+            return float((self.bins[index] + self.bins[index + 1]) / 2)
+        before = cumulative[index - 1] if index else 0
+        inside = self.histogram[index]
+        fraction = (target - before) / inside if inside else 0.0
+        return float(self.bins[index] + fraction * (self.bins[index + 1] - self.bins[index]))
+
+
+class SentimentGroup:
+    def __init__(self):
+        self.compound = RunningStats(COMPOUND_BINS)
+        self.positive_words = RunningStats(WORD_BINS, discrete=True)
+        self.negative_words = RunningStats(WORD_BINS, discrete=True)
+        self.labels = Counter()
+
+    @property
+    def count(self):
+        return sum(self.labels.values())
+
+    def add(self, labels, compound, positive_words, negative_words):
+        self.labels.update(labels)
+        self.compound.add(compound)
+        self.positive_words.add(positive_words)
+        self.negative_words.add(negative_words)
+
+    def merge(self, other):
+        self.labels.update(other.labels)
+        self.compound.merge(other.compound)
+        self.positive_words.merge(other.positive_words)
+        self.negative_words.merge(other.negative_words)
+
+    def stats_text(self):
+        label_counts = '\n'.join(f"  {label}: {self.labels[label]}" for label in self.label_order())
+        return (f"Statistics:\n"
+                f"Mean Positive Words: {self.positive_words.mean:.2f}\n"
+                f"Mean Negative Words: {self.negative_words.mean:.2f}\n"
+                f"Median Positive Words: {self.positive_words.quantile(0.5):.1f}\n"
+                f"Median Negative Words: {self.negative_words.quantile(0.5):.1f}\n"
+                f"Compound mean / median / p10 / p90: {self.compound.mean:.3f} / {self.compound.quantile(0.5):.3f}"
+                f" / {self.compound.quantile(0.1):.3f} / {self.compound.quantile(0.9):.3f}\n"
+                f"Total Articles: {self.count}\n"
+                f"Sentiment Distribution:\n{label_counts}\n")
+
+    def label_order(self):
+        return list(SENTIMENT_LABELS) + sorted((label for label in self.labels if label not in SENTIMENT_LABELS), key=str)
+
+
+class SentimentAggregates:
+    # Rolling per-ticker, per-day aggregates updated as articles arrive; `version` changes on every update
+    def __init__(self):
+        self.groups = {}
+        self.lock = threading.Lock()
+        self.version = 0
+
+    def add(self, ticker, overall_sentiment, compound=math.nan, positive_words=0, negative_words=0, timestamp=None):
+        day = time.strftime('%Y-%m-%d', time.localtime(timestamp))
+        self._add(ticker, day, [overall_sentiment], [compound], [positive_words], [negative_words])
+
+    def add_frame(self, frame):
+        # Vectorized load of an exported history/CSV frame, one batch per ticker and day
+        if 'Duplicate' in frame:
+            frame = frame[~frame['Duplicate'].fillna(False).astype(bool)]
+        frame = frame.assign(
+            _ticker=frame['Ticker'].fillna('').astype(str) if 'Ticker' in frame else '',
+            _day=frame['Time'].fillna('').astype(str).str[:10] if 'Time' in frame else '',
+            _compound=frame['Compound'] if 'Compound' in frame else math.nan,
+            _positive=count_words_series(frame['Positive Words']),
+            _negative=count_words_series(frame['Negative Words']))
+        for (ticker, day), group in frame.groupby(['_ticker', '_day'], sort=False):
+            self._add(ticker, day, group['Overall Sentiment'].dropna().tolist(), group['_compound'].to_numpy(),
+                      group['_positive'].to_numpy(), group['_negative'].to_numpy())
+
+    def _add(self, ticker, day, labels, compound, positive_words, negative_words):
+        with self.lock:
+            group = self.groups.get((ticker, day))
+            if group is None:
+                group = self.groups[(ticker, day)] = SentimentGroup()
+            group.add(labels, compound, positive_words, negative_words)
+            self.version += 1
+
+    def tickers(self):
+        with self.lock:
+            return sorted({ticker for ticker, _ in self.groups})
+
+    def summary(self, ticker=None, day=None):
+        # Merges the matching groups into a fresh SentimentGroup the caller can read without the lock
+        total = SentimentGroup()
+        with self.lock:
+            for (group_ticker, group_day), group in self.groups.items():
+                if (ticker is None or group_ticker == ticker) and (day is None or group_day == day):
+                    total.merge(group)
+        return total
@@ -0,0 +1,124 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.jlt', 'article_cache.sqlite')
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid')
+
+
+def normalize_url(url):
+    parts = urlparse(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.endswith(':80') and parts.scheme == 'http':
+        netloc = netloc[:-3]
+    elif netloc.endswith(':443') and parts.scheme == 'https':
+        netloc = netloc[:-4]
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunparse((parts.scheme.lower(), netloc, path, parts.params, urlencode(sorted(query)), ''))
+
+
+class CacheEntry:
+    def __init__(self, url, summary, sentiment, etag, last_modified, fetched_at):
+        self.url = url
+        self.summary = summary
+        self.sentiment = sentiment
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ArticleCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=3600, max_entries=50000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.writes = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)  # Empty for ':memory:' and bare file names
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS articles (
+            url TEXT PRIMARY KEY,
+            summary TEXT,
+            sentiment TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL,
+            accessed_at REAL)''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articles_accessed ON articles (accessed_at)')
+        self.conn.commit()
+
+    def get(self, url):
+        key = normalize_url(url)
+        with self.lock:
+            row = self.conn.execute('SELECT summary, sentiment, etag, last_modified, fetched_at FROM articles '
+                                    'WHERE url = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE articles SET accessed_at = ? WHERE url = ?', (time.time(), key))
+            self.conn.commit()
+        summary, sentiment, etag, last_modified, fetched_at = row
+        return CacheEntry(key, summary, json.loads(sentiment) if sentiment else None, etag, last_modified,
+                          fetched_at)
+
+    def is_fresh(self, entry):
+        return time.time() - entry.fetched_at < self.ttl
+
+    def put(self, url, summary, etag=None, last_modified=None, sentiment=None):
+        now = time.time()
+        with self.lock:
+            # A refetch with the same summary keeps its stored sentiment (or duplicate_of marker);
+            # a changed summary drops it so the article is scored again
+            self.conn.execute('INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?) '
+                              'ON CONFLICT(url) DO UPDATE SET '
+                              'sentiment = CASE WHEN articles.summary IS excluded.summary '
+                              'THEN COALESCE(excluded.sentiment, articles.sentiment) ELSE excluded.sentiment END, '
+                              'summary = excluded.summary, etag = excluded.etag, '
+                              'last_modified = excluded.last_modified, fetched_at = excluded.fetched_at, '
+                              'accessed_at = excluded.accessed_at',
+                              (normalize_url(url), summary, json.dumps(sentiment) if sentiment else None,
+                               etag, last_modified, now, now))
+            self._evict()
+            self.conn.commit()
+
+    def set_sentiment(self, url, sentiment):
+        with self.lock:
+            self.conn.execute('UPDATE articles SET sentiment = ? WHERE url = ?',
+                              (json.dumps(sentiment), normalize_url(url)))
+            self.conn.commit()
+
+    def touch(self, url):
+        # Revalidated with a 304, so the stored copy counts as freshly fetched
+        now = time.time()
+        with self.lock:
+            self.conn.execute('UPDATE articles SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                              (now, now, normalize_url(url)))
+            self.conn.commit()
+
+    def _evict(self):
+        self.writes += 1
+        if self.writes % 100:
+            return
+        count = self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute('DELETE FROM articles WHERE url IN '
+                              '(SELECT url FROM articles ORDER BY accessed_at LIMIT ?)',
+                              (count - self.max_entries,))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
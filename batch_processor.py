@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import threading
+
+from fetch_engine import ConcurrentFetcher
+from transport import RetryLater
+
+log = logging.getLogger(__name__)
+
+
+def read_url_list(path):
+    if path.endswith('.csv'):
+        import pandas as pd
+        urls = pd.read_csv(path).iloc[:, 0].dropna().astype(str).tolist()
+    else:
+        with open(path, 'r') as file:
+            urls = file.readlines()
+    # Keep the file order but drop blanks and repeats
+    return list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+
+
+class BatchCheckpoint:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.rows = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash
+                    self.rows[row['URL']] = row
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, url):
+        return url in self.rows
+
+    def record(self, row):
+        with self.lock:
+            self.rows[row['URL']] = row
+            self.file.write(json.dumps(row) + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class BatchProcessor:
+    def __init__(self, process, checkpoint_path, fetcher=None, on_result=None, on_progress=None):
+        self.process = process
+        self.checkpoint = BatchCheckpoint(checkpoint_path)
+        # Callers normally pass their shared fetcher; one made here is shut down when the run ends
+        self.owns_fetcher = fetcher is None
+        if fetcher is None:
+            fetcher = ConcurrentFetcher(max_workers=8, max_per_domain=2, rate=2.0, burst=2, jitter=0.5)
+        self.fetcher = fetcher
+        self.on_result = on_result or (lambda row: None)
+        self.on_progress = on_progress or (lambda done, total: None)
+        self.stop_event = threading.Event()
+
+    def run(self, urls):
+        total = len(urls)
+        done = 0
+        try:
+            pending = []
+            for url in urls:
+                if url in self.checkpoint:
+                    done += 1
+                    self.on_result(self.checkpoint.rows[url])
+                else:
+                    pending.append(url)
+            self.on_progress(done, total)
+
+            for url, row in self.fetcher.fetch_unordered(pending, self._process, self.stop_event):
+                if self.stop_event.is_set():
+                    break
+                done += 1
+                if row:
+                    self.checkpoint.record(row)
+                    self.on_result(row)
+                self.on_progress(done, total)
+        finally:
+            self.checkpoint.close()
+            if self.owns_fetcher:
+                self.fetcher.shutdown(wait=False)
+        return done
+
+    def _process(self, url):
+        try:
+            return self.process(url)
+        except RetryLater:
+            raise  # The fetcher reschedules it
+        except Exception as e:
+            log.warning("Batch processing failed for URL %s: %s", url, e, extra={'url': url})
+            return None
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,114 @@
+import functools
+import os
+import random
+import sys
+import threading
+import types
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Vocabulary for generated pages: neutral filler plus VADER-scored finance words so scoring does real work
+FILLER = ("the company said its quarter revenue analysts shares market investors guidance fiscal year "
+          "billion million percent board chief executive outlook sales margin segment cloud services "
+          "demand supply chain customers according to report statement results earnings per share").split()
+SCORED = ("strong growth gain record beat upbeat optimistic boost rally profit surge confident "
+          "weak loss decline miss concern risk slump drop warning lawsuit layoffs volatile").split()
+COMPANIES = ("Apple", "Microsoft", "Nvidia", "Tesla", "Amazon", "Alphabet", "Meta", "Netflix")
+
+
+def _sentence(rng, words):
+    tokens = [rng.choice(SCORED) if rng.random() < 0.12 else rng.choice(FILLER) for _ in range(words)]
+    tokens[0] = tokens[0].capitalize()
+    return ' '.join(tokens) + '.'
+
+
+def _paragraphs(rng, count):
+    return [' '.join(_sentence(rng, rng.randint(12, 28)) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+
+def _table(rng):
+    rows = ''.join(f"<tr><td>Q{quarter} {rng.randint(2019, 2025)}</td><td>${rng.uniform(10, 120):,.1f}B</td>"
+                   f"<td>{rng.uniform(-20, 30):+.1f}%</td><td>${rng.uniform(0.5, 5):.2f}</td></tr>"
+                   for quarter in range(1, 5))
+    return ("<table><thead><tr><th>Quarter</th><th>Revenue</th><th>YoY</th><th>EPS</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>")
+
+
+def make_article(seed, paragraphs=10, body=None):
+    # A news page shaped like the real ones: nav, scripts and ads around a headline, body text and a table
+    rng = random.Random(seed)
+    company = rng.choice(COMPANIES)
+    body = body if body is not None else _paragraphs(rng, paragraphs)
+    nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(12))
+    return (f"<!DOCTYPE html><html><head><title>{company} news {seed}</title>"
+            f"<script>window.dataLayer = [{{'page': {seed}}}];</script>"
+            "<style>body { font-family: sans-serif; }</style></head><body>"
+            f"<header><nav><ul>{nav}</ul></nav></header>"
+            f"<main><article><h1>{company} shares move after quarterly results</h1>"
+            f"<h2>{_sentence(rng, 10)}</h2>"
+            + ''.join(f"<p>{paragraph}</p>" for paragraph in body[:len(body) // 2])
+            + _table(rng)
+            + ''.join(f"<p>{paragraph}</p>" for paragraph in body[len(body) // 2:])
+            + "</article><aside><div class=\"ad\">Advertisement</div></aside></main>"
+            "<footer><p>Copyright. All rights reserved.</p></footer></body></html>")
+
+
+def write_pages(directory, count, seed=0, wire_share=0.2):
+    # Every so often a page carries a wire story already published on an earlier page, as syndication does
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    wire_bodies = []
+    names = []
+    for index in range(count):
+        body = None
+        if wire_bodies and rng.random() < wire_share:
+            body = rng.choice(wire_bodies)
+        html = make_article(seed * 100003 + index, body=body)
+        if body is None and index % 10 == 0:
+            wire_bodies.append(_paragraphs(random.Random(index), 10))
+        name = f"article{index:05d}.html"
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as file:
+            file.write(html)
+        names.append(name)
+    return names
+
+
+def recorded_pages(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(('.html', '.htm')))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real sites behind the pooled session
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    # Serves a directory of pages on 127.0.0.1 from a background thread
+    def __init__(self, directory):
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self, name):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/{name}"
+
+
+def stub_googlesearch(urls):
+    # scrape_google_search imports `search` at call time, so a module in sys.modules replaces the real one.
+    # Every fixture URL is returned regardless of num_results so one search exercises the whole set.
+    module = types.ModuleType('googlesearch')
+    module.search = lambda query, num_results=10, **options: iter(list(urls))
+    previous = sys.modules.get('googlesearch')
+    sys.modules['googlesearch'] = module
+    return previous
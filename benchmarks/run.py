@@ -0,0 +1,470 @@
+# Benchmarks for the scraping pipeline against a local fixture server.
+#
+#   python benchmarks/run.py                           # every stage, JSON results on stdout
+#   python benchmarks/run.py -s parse,score -o new.json --baseline old.json
+#   python benchmarks/run.py --profile prof/ --py-spy flames/
+#
+# Pages are generated (or taken from --pages DIR, e.g. saved real articles) and served from 127.0.0.1;
+# googlesearch.search is replaced so the end-to-end stage never leaves the machine.
+import argparse
+import cProfile
+import json
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import FixtureServer, recorded_pages, stub_googlesearch, write_pages  # noqa: E402
+
+STAGES = {}
+
+
+def stage(name):
+    def register(function):
+        STAGES[name] = function
+        return function
+    return register
+
+
+class StageResult:
+    def __init__(self):
+        self.latencies = []
+        self.bytes = 0
+        self.items = 0
+        self.elapsed = 0.0
+        self.extra = {}
+        self.lock = threading.Lock()
+
+    def record(self, seconds, size=0):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.bytes += size
+            self.items += 1
+
+    def measure(self, items, function, size=None):
+        # Per-item latency for in-thread stages; the stage's wall time covers the whole loop
+        with self.clock():
+            for item in items:
+                start = time.perf_counter()
+                function(item)
+                self.record(time.perf_counter() - start, size(item) if size else 0)
+
+    @contextmanager
+    def clock(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def summary(self):
+        import numpy as np
+
+        summary = {'items': self.items, 'seconds': round(self.elapsed, 4),
+                   'throughput': round(self.items / self.elapsed, 2) if self.elapsed else None}
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.array(self.latencies) * 1000, [50, 95, 99])
+            summary['latency_ms'] = {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3),
+                                     'max': round(max(self.latencies) * 1000, 3)}
+        if self.bytes and self.elapsed:
+            summary['mb_per_s'] = round(self.bytes / self.elapsed / 1e6, 2)
+        summary.update(self.extra)
+        return summary
+
+
+class Context:
+    # Fixtures and expensive shared objects, built once and reused by every stage that needs them
+    def __init__(self, directory, names, server, workers):
+        self.directory = directory
+        self.names = names
+        self.server = server
+        self.workers = workers
+        self.urls = [server.url(name) for name in names]
+        self.pages = []
+        for name in names:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as file:
+                self.pages.append(file.read())
+        self._analyzer = None
+        self._summaries = None
+
+    def analyzer(self):
+        if self._analyzer is None:
+            from lexicon import make_analyzer
+            self._analyzer = make_analyzer()
+        return self._analyzer
+
+    def summaries(self):
+        if self._summaries is None:
+            from extraction import parse_document
+            self._summaries = [parse_document(page).summary for page in self.pages]
+        return self._summaries
+
+    def scraper(self, **options):
+        # Everything in memory and no proxies, so only the code under test is measured
+        from article_cache import ArticleCache
+        from domain_filter import DomainFilter
+        from history_store import HistoryStore
+        from identity import IdentityManager
+        from scrapper import USER_AGENTS, FinanceScraper
+
+        options.setdefault('sentiment_analyzer', self.analyzer())
+        options.setdefault('session', self.session())
+        return FinanceScraper("Benchmark", "BNCH", [], lambda *article: None, cache=ArticleCache(':memory:'),
+                              history=HistoryStore(':memory:'), identities=IdentityManager([], USER_AGENTS),
+                              domain_filter=DomainFilter(None), **options)
+
+    def session(self):
+        from transport import create_session
+
+        # One keep-alive connection per fetch thread, since every fixture is on the same host
+        return create_session(pool_maxsize=self.workers)
+
+    def fetcher(self):
+        from fetch_engine import ConcurrentFetcher
+
+        # Every fixture lives on one host, so the per-domain limits are opened up to the worker count
+        return ConcurrentFetcher(max_workers=self.workers, max_per_domain=self.workers, rate=1e6, burst=1e6,
+                                 jitter=0)
+
+
+@stage('fetch')
+def bench_fetch(context, result):
+    session = context.session()
+    fetcher = context.fetcher()
+
+    def fetch(url):
+        start = time.perf_counter()
+        body = session.get(url, timeout=10).content
+        result.record(time.perf_counter() - start, len(body))
+
+    try:
+        with result.clock():
+            for _ in fetcher.fetch_unordered(context.urls, fetch):
+                pass
+    finally:
+        fetcher.shutdown()
+        session.close()
+
+
+@stage('parse')
+def bench_parse(context, result):
+    import extraction
+
+    def parse(page):
+        extraction._cache.clear()  # Measure the parser, not the LRU in front of it
+        extraction.parse_document(page).summary
+
+    result.measure(context.pages, parse, size=lambda page: len(page.encode('utf-8')))
+
+
+@stage('tables')
+def bench_tables(context, result):
+    from extraction import parse_document
+    from table_extract import is_financial_table, table_to_dataframe
+
+    documents = [parse_document(page) for page in context.pages]
+
+    def convert(document):
+        return [table_to_dataframe(table) for table in document.tables if is_financial_table(table)]
+
+    convert(documents[0])  # pandas is imported on first use; keep that out of the latencies
+    result.measure(documents, convert)
+
+
+@stage('score')
+def bench_score(context, result):
+    analyzer = context.analyzer()
+    summaries = context.summaries()
+    result.measure(summaries, analyzer.polarity_scores, size=len)
+
+
+@stage('score_pool')
+def bench_score_pool(context, result):
+    from scoring_pool import ScoringPool
+
+    summaries = context.summaries()
+    pool = ScoringPool()
+    try:
+        pool.polarity_scores("warm up")  # Worker start-up and lexicon load are not part of the steady state
+        futures = []
+        with result.clock():
+            # Everything is queued at once, so latency here is time in queue plus scoring under full load
+            for text in summaries:
+                submitted = time.perf_counter()
+                future = pool.submit(text, sentences=True)
+                future.add_done_callback(lambda _, submitted=submitted, size=len(text):
+                                         result.record(time.perf_counter() - submitted, size))
+                futures.append(future)
+            for future in futures:
+                future.result()
+        result.extra['workers'] = pool.workers
+    finally:
+        pool.shutdown()
+
+
+@stage('word_buckets')
+def bench_word_buckets(context, result):
+    from extraction import parse_document
+    from sentiment import BatchSentimentScorer
+
+    scorer = BatchSentimentScorer(context.analyzer())
+    token_lists = [parse_document(page).tokens for page in context.pages]
+    result.measure(token_lists, scorer.distribution)
+    result.extra['tokens'] = sum(len(tokens) for tokens in token_lists)
+
+
+@stage('dedup')
+def bench_dedup(context, result):
+    from dedup import NearDuplicateIndex
+
+    index = NearDuplicateIndex()
+    duplicates = []
+    result.measure(zip(context.urls, context.summaries()),
+                   lambda item: duplicates.append(index.check(item[1], item[0])[1] is not None))
+    result.extra['duplicates'] = sum(duplicates)
+
+
+@stage('history')
+def bench_history(context, result):
+    from history_store import HistoryStore
+
+    store = HistoryStore(':memory:')
+    sentiment = {'pos': 0.2, 'neu': 0.7, 'neg': 0.1, 'compound': 0.4}
+    rows = [(url, summary) for url, summary in zip(context.urls, context.summaries())] * 10
+    try:
+        result.measure(rows, lambda row: store.add_article("BNCH", "Benchmark", row[0], row[1], sentiment, "Good"))
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            exported = store.export_csv(os.path.join(directory, 'history.csv'))
+            result.extra['export_rows_per_s'] = round(exported / (time.perf_counter() - start), 1)
+    finally:
+        store.close()
+
+
+@stage('aggregate')
+def bench_aggregate(context, result):
+    import numpy as np
+    import pandas as pd
+    from analytics import SENTIMENT_LABELS, SentimentAggregates
+
+    # Same shape as an exported history file going through the Import CSV path
+    rows = 200000
+    generator = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'Time': pd.to_datetime(1.7e9 + generator.integers(0, 30 * 86400, rows), unit='s').astype(str),
+        'Ticker': generator.choice(['AAPL', 'MSFT', 'NVDA', 'TSLA'], rows),
+        'Positive Words': generator.choice(['gain, growth', 'strong', '', 'record, beat, upbeat'], rows),
+        'Negative Words': generator.choice(['loss', '', 'weak, decline'], rows),
+        'Overall Sentiment': generator.choice(SENTIMENT_LABELS, rows),
+        'Compound': generator.uniform(-1, 1, rows)})
+    chunks = [frame.iloc[start:start + 100000] for start in range(0, rows, 100000)]
+    aggregates = SentimentAggregates()
+    result.measure(chunks, aggregates.add_frame)
+    result.items = rows  # Throughput in rows, latency per chunk
+
+
+@stage('render')
+def bench_render(context, result):
+    from document_buffer import ChunkedDocument
+
+    document = ChunkedDocument('\n\n'.join(context.summaries()) * 20)
+    window = 5000
+    positions = range(0, len(document), window)
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        # No display: time what the view pulls from the document on every page instead of the widget
+        result.extra['mode'] = f"slice only ({e.__class__.__name__})"
+        result.measure(positions, lambda position: document.slice(max(0, position - 2000), position + window + 2000))
+        return
+
+    from text_view import VirtualTextView
+
+    root.withdraw()
+    try:
+        view = VirtualTextView(root, window=window, margin=2000)
+        view.pack()
+        view.document = document
+
+        def show(position):
+            view.show(position)
+            root.update_idletasks()
+
+        result.extra['mode'] = 'tk'
+        result.measure(positions, show)
+    finally:
+        root.destroy()
+
+
+@stage('pipeline')
+def bench_pipeline(context, result):
+    # Search -> fetch -> parse -> dedup -> score -> history, as one scraping cycle sees it
+    previous = stub_googlesearch(context.urls)
+    scraper = context.scraper(fetcher=context.fetcher())
+    published = []
+    scraper.display_callback = lambda *article: published.append(time.perf_counter())
+    try:
+        with result.clock():
+            scraper.scrape_google_search()
+        result.items = len(context.urls)
+        result.extra['published'] = len(published)
+        result.extra['duplicates'] = len(context.urls) - len(published)
+    finally:
+        scraper.fetcher.shutdown()
+        scraper.history.close()
+        if previous is None:
+            sys.modules.pop('googlesearch', None)
+        else:
+            sys.modules['googlesearch'] = previous
+
+
+@contextmanager
+def py_spy(path):
+    # Samples this process from outside for the duration of the block; py-spy writes the SVG on SIGINT
+    executable = shutil.which('py-spy')
+    if executable is None:
+        print("py-spy not found on PATH, skipping flame graph", file=sys.stderr)
+        yield
+        return
+    process = subprocess.Popen([executable, 'record', '--pid', str(os.getpid()), '--output', path,
+                                '--format', 'flamegraph', '--rate', '250', '--nonblocking'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    time.sleep(0.5)  # Let it attach before the stage starts
+    try:
+        yield
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            _, errors = process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            _, errors = process.communicate()
+        if process.returncode not in (0, -signal.SIGINT):
+            print(f"py-spy failed: {errors.decode(errors='replace').strip()}", file=sys.stderr)
+
+
+def run_stage(name, context, profile_dir=None, flame_dir=None):
+    result = StageResult()
+    profiler = cProfile.Profile() if profile_dir else None
+    spy = py_spy(os.path.join(flame_dir, f"{name}.svg")) if flame_dir else None
+    try:
+        with spy or _nothing():
+            if profiler:
+                profiler.enable()
+            try:
+                STAGES[name](context, result)
+            finally:
+                if profiler:
+                    profiler.disable()
+    except ImportError as e:
+        return {'skipped': f"missing dependency: {e.name}"}
+    except Exception as e:
+        return {'error': f"{e.__class__.__name__}: {e}"}
+    if profiler:
+        profiler.dump_stats(os.path.join(profile_dir, f"{name}.prof"))
+    return result.summary()
+
+
+@contextmanager
+def _nothing():
+    yield
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    # A stage regresses when its throughput drops by more than `tolerance` against the baseline run
+    regressions = []
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name, {})
+        if not current.get('throughput') or not previous.get('throughput'):
+            continue
+        change = current['throughput'] / previous['throughput'] - 1
+        current['change'] = round(change, 3)
+        flag = 'REGRESSION' if change < -tolerance else ''
+        print(f"{name:14} {previous['throughput']:>12.1f} -> {current['throughput']:>12.1f}/s {change:+8.1%} {flag}",
+              file=sys.stderr)
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the scraping pipeline against local fixtures")
+    parser.add_argument('-s', '--stages', default=','.join(STAGES),
+                        help=f"Comma separated stages (default: all of {', '.join(STAGES)})")
+    parser.add_argument('-n', '--count', type=int, default=200, help="Generated pages (default: 200)")
+    parser.add_argument('--pages', help="Serve saved .html pages from this directory instead of generated ones")
+    parser.add_argument('--workers', type=int, default=8, help="Fetch threads (default: 8)")
+    parser.add_argument('-o', '--output', default='-', help="JSON results file (default: stdout)")
+    parser.add_argument('--baseline', help="Earlier results to compare against; exits 1 on a regression")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed throughput drop against the baseline (default: 0.2)")
+    parser.add_argument('--profile', metavar='DIR', help="Write a cProfile <stage>.prof per stage")
+    parser.add_argument('--py-spy', metavar='DIR', dest='flames', help="Record a py-spy flame graph <stage>.svg per stage")
+    parser.add_argument('--log-level', default='WARNING', help="Log level for the code under test (default: WARNING)")
+    return parser
+
+
+def main(argv=None):
+    from log_format import configure_logging
+    from metrics import REGISTRY
+
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        build_parser().error(f"unknown stage(s): {', '.join(unknown)}")
+    for directory in (args.profile, args.flames):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    results = {'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'revision': git_revision(),
+               'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+               'pages': None, 'stages': {}}
+    with tempfile.TemporaryDirectory() as generated:
+        directory = args.pages or generated
+        page_names = recorded_pages(directory) if args.pages else write_pages(directory, args.count)
+        results['pages'] = {'count': len(page_names), 'source': args.pages or 'generated'}
+        with FixtureServer(directory) as server:
+            context = Context(directory, page_names, server, args.workers)
+            # Anything printed by the code under test would otherwise end up in the JSON on stdout
+            with redirect_stdout(sys.stderr):
+                for name in names:
+                    print(f"Running {name}...", file=sys.stderr)
+                    results['stages'][name] = run_stage(name, context, args.profile, args.flames)
+
+    # The runtime counters the stages drove (fetch histograms, cache lookups, queue gauges...)
+    results['metrics'] = REGISTRY.snapshot()['metrics']
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        results['regressions'] = regressions
+    text = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import atexit
+import logging
+import queue
+import random
+import re
+import threading
+from contextlib import contextmanager
+
+from transport import RetryLater, raise_for_retry
+
+log = logging.getLogger(__name__)
+
+JS_REQUIRED = re.compile(r'enable javascript|javascript is (?:disabled|required)|'
+                         r'<div id="(?:root|app|__next)">\s*</div>', re.I)
+PARAGRAPH_TAG = re.compile(r'<p[\s>]', re.I)
+
+
+def make_chrome_driver(user_agents):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument(f"user-agent={random.choice(user_agents)}")
+    return webdriver.Chrome(options=options)
+
+
+def needs_javascript(html):
+    if JS_REQUIRED.search(html):
+        return True
+    return len(PARAGRAPH_TAG.findall(html)) < 2
+
+
+class StaticDriver:
+    # Stand-in for a WebDriver that serves canned HTML, for running without Chrome
+    def __init__(self, pages):
+        self.pages = pages
+        self.page_source = ''
+        self.closed = False
+
+    def get(self, url):
+        self.page_source = self.pages(url) if callable(self.pages) else self.pages[url]
+
+    def find_element(self, by, value):
+        return self.page_source
+
+    def quit(self):
+        self.closed = True
+
+
+class BrowserPool:
+    def __init__(self, driver_factory, size=2, max_pages=50, timeout=60):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()  # Reuse the most recently used, warmest driver first
+        self.pages = {}
+        self.starting = 0  # Slots reserved for drivers still being launched
+        self.lock = threading.Lock()
+        self.closed = False
+        atexit.register(self.close)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            start = len(self.pages) + self.starting < self.size
+            if start:
+                self.starting += 1
+        if start:
+            # Launching Chrome takes seconds, so only the slot is reserved under the lock
+            try:
+                driver = self.driver_factory()
+            except BaseException:
+                with self.lock:
+                    self.starting -= 1
+                raise
+            with self.lock:
+                self.starting -= 1
+                self.pages[id(driver)] = 0
+            return driver
+        try:
+            return self.idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No browser available in the pool")
+
+    def release(self, driver, broken=False):
+        with self.lock:
+            self.pages[id(driver)] += 1
+            recycle = broken or self.closed or self.pages[id(driver)] >= self.max_pages
+            if recycle:
+                del self.pages[id(driver)]
+        if recycle:
+            self._quit(driver)
+        else:
+            self.idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=True)
+            raise
+        self.release(driver)
+
+    def fetch(self, url, wait=10):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.lease() as driver:
+            driver.get(url)
+            WebDriverWait(driver, wait).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            return driver.page_source
+
+    def close(self):
+        self.closed = True
+        atexit.unregister(self.close)  # Drivers still leased are quit as they come back
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                self.pages.pop(id(driver), None)
+            self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            log.warning("Error closing browser: %s", e)
+
+
+def fetch_page_source(url, session, pool, headers=None, timeout=10):
+    # Plain HTTP first; only pages that need JavaScript go to a browser
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        raise_for_retry(response)  # Rate limited or down: a browser would only hit the same wall
+        if response.status_code == 200 and not needs_javascript(response.text):
+            return response.text
+    except RetryLater:
+        raise
+    except Exception as e:
+        log.info("Plain fetch failed for URL %s, falling back to browser: %s", url, e, extra={'url': url})
+    return pool.fetch(url)
@@ -0,0 +1,259 @@
+import argparse
+import json
+import logging
+import sys
+from contextlib import redirect_stdout
+
+log = logging.getLogger(__name__)
+
+
+def write_row(out, row):
+    out.write(json.dumps(row) + '\n')
+    out.flush()
+
+
+def open_output(path):
+    if path == '-':
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8')
+
+
+def shared_resources():
+    # One cache, history connection and browser pool per command, handed to the scraper and closed by the caller
+    from article_cache import ArticleCache
+    from browser_pool import BrowserPool, make_chrome_driver
+    from history_store import HistoryStore
+    from scrapper import USER_AGENTS
+
+    return ArticleCache(), HistoryStore(), BrowserPool(lambda: make_chrome_driver(USER_AGENTS))
+
+
+def run_search(args, out):
+    from scoring_pool import ScoringPool
+    from scrapper import FinanceScraper, overall_sentiment_label
+
+    def emit(company, url, summary, sentiment):
+        write_row(out, {"Company": company, "Ticker": args.ticker, "URL": url, "Summary": summary,
+                        "Compound": sentiment['compound'],
+                        "Overall Sentiment": overall_sentiment_label(sentiment['compound'])})
+
+    seo_words = [word.strip() for word in args.seo_words.split(',') if word.strip()]
+    pool = ScoringPool()
+    cache, history, browsers = shared_resources()
+    scraper = FinanceScraper(args.company, args.ticker, seo_words, emit, sentiment_analyzer=pool,
+                             cache=cache, history=history, browser_pool=browsers)
+    try:
+        if args.duration:
+            scraper.start_scraping(args.interval, args.duration)
+        else:
+            scraper.scrape_google_search()
+    finally:
+        scraper.fetcher.shutdown(wait=False)
+        pool.shutdown()
+        browsers.close()
+        history.close()
+        cache.close()
+        log.info("Transport statistics:\n%s", scraper.fetcher.stats.summary())
+        log.info("Identity health:\n%s", scraper.identities.summary())
+
+
+def run_batch(args, out):
+    from batch_processor import BatchProcessor, read_url_list
+    from fetch_engine import ConcurrentFetcher
+    from scoring_pool import ScoringPool
+    from scrapper import FinanceScraper
+
+    urls = read_url_list(args.url_file)
+    pool = ScoringPool()
+    cache, history, browsers = shared_resources()
+    session = FinanceScraper.create_session()
+    # The scraper uses the batch's fetcher instead of building an idle one of its own
+    fetcher = ConcurrentFetcher(max_workers=8, max_per_domain=2, rate=2.0, burst=2, jitter=0.5,
+                                stats=session.stats)
+    scraper = FinanceScraper("", "", [], None, fetcher=fetcher, session=session, sentiment_analyzer=pool,
+                             cache=cache, history=history, browser_pool=browsers)
+    processor = BatchProcessor(scraper.process_url, args.checkpoint or args.url_file + '.checkpoint.jsonl',
+                               fetcher=fetcher,
+                               on_result=lambda row: write_row(out, row),
+                               on_progress=lambda done, total: log.info("%d / %d URLs processed", done, total))
+    try:
+        processor.run(urls)
+    finally:
+        fetcher.shutdown(wait=False)
+        pool.shutdown()
+        browsers.close()
+        history.close()
+        cache.close()
+        log.info("Transport statistics:\n%s", session.stats.summary())
+
+
+def run_export(args, out):
+    import pandas as pd
+
+    # Stream the JSON lines through in chunks rather than loading the whole file
+    header = True
+    with open(args.output, 'w', encoding='utf-8', newline='') as file:
+        for chunk in pd.read_json(args.input, lines=True, chunksize=10000, precise_float=True):
+            chunk.to_csv(file, index=False, header=header)
+            header = False
+    log.info("Exported %s to %s", args.input, args.output)
+
+
+def run_tables(args, out):
+    import requests
+    from extraction import parse_document
+    from table_extract import export_tables, is_financial_table
+
+    for index, source in enumerate(args.sources, start=1):
+        if source.startswith(('http://', 'https://')):
+            html = requests.get(source, timeout=10).text
+        else:
+            with open(source, 'r', encoding='utf-8') as file:
+                html = file.read()
+        tables = parse_document(html).tables
+        if not args.all:
+            tables = [table for table in tables if is_financial_table(table)]
+        for path in export_tables(tables, args.directory, args.format, prefix=f"source{index}_table"):
+            write_row(out, {"Source": source, "Path": path})
+
+
+def run_sentiment(args, out):
+    from file_loader import iter_text_blocks, stream_sentiment
+
+    if not args.sentences:
+        for path in args.files:
+            totals = stream_sentiment(path)
+            write_row(out, {"File": path, "Sentiment Scores": totals, "Words": sum(totals.values())})
+        return
+
+    from scoring_pool import ScoringPool, split_sentences
+
+    # Sentence-level VADER across all cores; each text block is split into sentences that are scored in batches
+    pool = ScoringPool()
+    try:
+        for path in args.files:
+            for block in iter_text_blocks(path):
+                sentences = split_sentences(block)
+                for sentence, result in zip(sentences, pool.map(sentences, sentences=False)):
+                    write_row(out, {"File": path, "Sentence": sentence, **result['document']})
+    finally:
+        pool.shutdown()
+
+
+def run_history(args, out):
+    import time
+    from history_store import HistoryStore
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    rows = HistoryStore().export_csv(args.output, ticker=args.ticker, since=since)
+    log.info("Exported %d history rows to %s", rows, args.output)
+
+
+def run_domains(args, out):
+    from domain_filter import shared_filter
+    from scrapper import GREENLIST
+
+    domains = shared_filter(GREENLIST)
+    for domain in args.block or []:
+        if domains.block(domain, ttl=args.ttl * 3600, reason='manual', whole_site=False) is None:
+            log.warning("Not blocking %s: it is always allowed", domain)
+    for domain in args.allow or []:
+        domains.allow(domain)
+    for domain in args.remove or []:
+        domains.remove(domain)
+    for domain, rule in sorted(domains.rules().items()):
+        write_row(out, {"Domain": domain, **rule})
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='scrapper', description="JLT finance news scraper")
+    parser.add_argument('--log-level', default='INFO', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'))
+    parser.add_argument('--log-json', action='store_true', help="Log one JSON object per line to stderr")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics (the GUI defaults to 9464)")
+    parser.add_argument('--metrics-dump', metavar='PATH',
+                        help="Write a JSON metrics snapshot to PATH periodically (the GUI defaults to ~/.jlt/metrics.json)")
+    parser.add_argument('--metrics-interval', type=float, default=60, help="Seconds between JSON metrics dumps")
+    commands = parser.add_subparsers(dest='command')
+
+    commands.add_parser('gui', help="Launch the JLT Terminal (default)")
+
+    search = commands.add_parser('search', help="Scrape Google results for a company and score them")
+    search.add_argument('company')
+    search.add_argument('ticker')
+    search.add_argument('--seo-words', default='', help="Comma separated extra search words")
+    search.add_argument('--interval', type=int, default=300, help="Seconds between searches")
+    search.add_argument('--duration', type=int, default=0, help="Minutes to keep searching (0 = search once)")
+    search.add_argument('-o', '--output', default='-', help="JSON lines output file (default: stdout)")
+
+    batch = commands.add_parser('batch', help="Fetch and score every URL in a .txt/.csv file")
+    batch.add_argument('url_file')
+    batch.add_argument('--checkpoint', help="Checkpoint file (default: <url_file>.checkpoint.jsonl)")
+    batch.add_argument('-o', '--output', default='-', help="JSON lines output file (default: stdout)")
+
+    tables = commands.add_parser('tables', help="Extract financial tables from HTML files or URLs")
+    tables.add_argument('sources', nargs='+')
+    tables.add_argument('-d', '--directory', default='.', help="Output directory")
+    tables.add_argument('--format', choices=('csv', 'parquet'), default='csv')
+    tables.add_argument('--all', action='store_true', help="Export every table, not just financial ones")
+    tables.add_argument('-o', '--output', default='-', help="JSON lines list of written files (default: stdout)")
+
+    sentiment = commands.add_parser('sentiment', help="Stream large text/CSV files through the word sentiment scorer")
+    sentiment.add_argument('files', nargs='+')
+    sentiment.add_argument('--sentences', action='store_true',
+                           help="Score every sentence with VADER in a process pool instead of word buckets")
+    sentiment.add_argument('-o', '--output', default='-', help="JSON lines output file (default: stdout)")
+
+    history = commands.add_parser('history', help="Export the stored search history to CSV")
+    history.add_argument('output')
+    history.add_argument('--ticker', help="Only rows for this ticker")
+    history.add_argument('--hours', type=float, default=0, help="Only rows from the last N hours (0 = all)")
+
+    domains = commands.add_parser('domains', help="List or edit the persisted blocked/allowed domains")
+    domains.add_argument('--block', nargs='+', metavar='DOMAIN')
+    domains.add_argument('--allow', nargs='+', metavar='DOMAIN')
+    domains.add_argument('--remove', nargs='+', metavar='DOMAIN')
+    domains.add_argument('--ttl', type=float, default=6, help="Hours a manual block lasts (0 = permanent)")
+    domains.add_argument('-o', '--output', default='-', help="JSON lines output file (default: stdout)")
+
+    export = commands.add_parser('export', help="Convert JSON lines results to CSV")
+    export.add_argument('input')
+    export.add_argument('output')
+    return parser
+
+
+def main(argv=None):
+    from log_format import configure_logging
+    from metrics import start_metrics
+
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level, args.log_json)
+    if args.command in (None, 'gui'):
+        from terminal_app import run_app
+        options = {'metrics_interval': args.metrics_interval}
+        if args.metrics_port is not None:
+            options['metrics_port'] = args.metrics_port
+        if args.metrics_dump:
+            options['metrics_dump'] = args.metrics_dump
+        run_app(**options)
+        return
+
+    handler = {'search': run_search, 'batch': run_batch, 'tables': run_tables, 'sentiment': run_sentiment,
+               'history': run_history, 'domains': run_domains, 'export': run_export}[args.command]
+    out = sys.stdout if args.command in ('export', 'history') else open_output(args.output)
+    server, dumper = start_metrics(args.metrics_port, args.metrics_dump, args.metrics_interval)
+    # Results go to the real stdout; logs (and anything a library prints) go to stderr
+    try:
+        with redirect_stdout(sys.stderr):
+            handler(args, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if dumper:
+            dumper.stop()
+        if server:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
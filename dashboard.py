@@ -0,0 +1,126 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from analytics import MAX_WORDS
+
+ALL_TICKERS = "All"
+
+
+class SentimentDashboard:
+    # Bar charts redrawn from SentimentAggregates; steady-state updates only repaint the bars (blitting)
+    def __init__(self, parent, aggregates, interval=1000):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.aggregates = aggregates
+        self.interval = interval
+        self.version = None
+        self.background = None
+
+        self.frame = tk.Frame(parent)
+        controls = tk.Frame(self.frame)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        tk.Label(controls, text="Ticker:").pack(side=tk.LEFT)
+        self.ticker = ttk.Combobox(controls, values=[ALL_TICKERS], state='readonly', width=15,
+                                   postcommand=self.refresh_tickers)
+        self.ticker.set(ALL_TICKERS)
+        self.ticker.bind('<<ComboboxSelected>>', lambda event: self.update_chart())
+        self.ticker.pack(side=tk.LEFT, padx=5)
+        self.stats = tk.Label(self.frame, justify=tk.LEFT, anchor=tk.W)
+        self.stats.pack(fill=tk.X, padx=10, pady=5)
+
+        self.figure = Figure(figsize=(10, 6))
+        self.words_axes, self.labels_axes = self.figure.subplots(1, 2, gridspec_kw={'width_ratios': [2, 1]})
+        positions = np.arange(MAX_WORDS + 1)
+        zeros = np.zeros(len(positions))
+        self.positive_bars = self.words_axes.bar(positions - 0.2, zeros, 0.4, color='green', label='Positive Words',
+                                                 animated=True)
+        self.negative_bars = self.words_axes.bar(positions + 0.2, zeros, 0.4, color='red', label='Negative Words',
+                                                 animated=True)
+        self.words_axes.set_xticks(positions[::2], [str(n) for n in positions[:-1:2]] + [f"{MAX_WORDS}+"])
+        self.words_axes.set_xlabel('Number of Words')
+        self.words_axes.set_ylabel('Frequency')
+        self.words_axes.set_title('Distribution of Positive and Negative Words')
+        self.words_axes.legend()
+        self.label_names = []
+        self.label_bars = []
+        self.figure.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Every full draw (first show, resize, rescale) refreshes the cached background
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.refresh()
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def refresh_tickers(self):
+        self.ticker['values'] = [ALL_TICKERS] + self.aggregates.tickers()
+
+    def refresh(self):
+        if not self.frame.winfo_exists():
+            return
+        if self.aggregates.version != self.version:
+            self.update_chart()
+        self.frame.after(self.interval, self.refresh)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_bars()
+
+    def draw_bars(self):
+        for bar in (*self.positive_bars, *self.negative_bars):
+            self.words_axes.draw_artist(bar)
+        for bar in self.label_bars:
+            self.labels_axes.draw_artist(bar)
+
+    def update_chart(self):
+        self.version = self.aggregates.version
+        ticker = self.ticker.get()
+        group = self.aggregates.summary(None if ticker == ALL_TICKERS else ticker)
+        self.stats.config(text=group.stats_text())
+
+        positive = group.positive_words.histogram
+        negative = group.negative_words.histogram
+        for bar, height in zip(self.positive_bars, positive):
+            bar.set_height(height)
+        for bar, height in zip(self.negative_bars, negative):
+            bar.set_height(height)
+
+        full_redraw = self.rescale(self.words_axes, max(positive.max(), negative.max()))
+        names = group.label_order()
+        counts = [group.labels[name] for name in names]
+        if names != self.label_names:
+            self.build_label_bars(names)
+            full_redraw = True
+        for bar, height in zip(self.label_bars, counts):
+            bar.set_height(height)
+        full_redraw = self.rescale(self.labels_axes, max(counts)) or full_redraw
+
+        if full_redraw or self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_bars()
+            self.canvas.blit(self.figure.bbox)
+
+    def build_label_bars(self, names):
+        for bar in self.label_bars:
+            bar.remove()
+        self.label_names = names
+        self.label_bars = list(self.labels_axes.bar(range(len(names)), np.zeros(len(names)), color='steelblue',
+                                                    animated=True))
+        self.labels_axes.set_xticks(range(len(names)), names, rotation=30, ha='right')
+        self.labels_axes.set_title('Overall Sentiment')
+
+    @staticmethod
+    def rescale(axes, peak):
+        # Axis limits only change when the data outgrows them (or shrinks well below), forcing a full draw
+        top = axes.get_ylim()[1]
+        if peak <= top and (peak > top / 4 or top <= 1):
+            return False
+        axes.set_ylim(0, max(peak * 1.25, 1))
+        return True
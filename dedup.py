@@ -0,0 +1,115 @@
+import hashlib
+import itertools
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from extraction import WORD
+
+SHINGLE_WORDS = 3
+MIN_TOKENS = 8  # Shorter texts are too thin to fingerprint reliably
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingles(text):
+    tokens = WORD.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return set()
+    return {' '.join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+
+
+class MinHasher:
+    # One vectorized pass: every shingle hash goes through all permutations as a single numpy broadcast
+    def __init__(self, permutations=128, seed=1):
+        generator = np.random.default_rng(seed)
+        self.a = generator.integers(1, MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+        self.b = generator.integers(0, MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+
+    def signature(self, text):
+        pieces = shingles(text)
+        if not pieces:
+            return None
+        digests = b''.join(hashlib.blake2b(piece.encode('utf-8'), digest_size=4).digest() for piece in pieces)
+        hashes = np.frombuffer(digests, dtype='<u4').astype(np.uint64)
+        # Wrapping uint64 arithmetic is intended here, as in the usual (a*x + b) mod p MinHash
+        with np.errstate(over='ignore'):
+            permuted = (hashes[:, None] * self.a + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(first, second):
+    # Fraction of matching MinHash slots estimates the Jaccard similarity of the shingle sets
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class _Fingerprint:
+    def __init__(self, key, signature, cluster, url, added_at):
+        self.key = key
+        self.signature = signature
+        self.cluster = cluster
+        self.url = url
+        self.added_at = added_at
+
+
+class NearDuplicateIndex:
+    # Banded LSH over MinHash signatures: 32 bands of 4 rows put pairs above ~0.5 Jaccard in a shared
+    # bucket with high probability; candidates are then checked against `threshold`.
+    # Entries older than `window` seconds (or beyond `max_entries`) are forgotten.
+    def __init__(self, permutations=128, bands=32, threshold=0.7, window=24 * 3600, max_entries=100000):
+        self.hasher = MinHasher(permutations)
+        self.bands = bands
+        self.rows = permutations // bands
+        self.threshold = threshold
+        self.window = window
+        self.max_entries = max_entries
+        self.buckets = {}
+        self.entries = deque()
+        self.keys = itertools.count()
+        self.lock = threading.Lock()
+
+    def _bands(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def check(self, text, url=None, now=None):
+        # Returns (cluster id, url of the earlier copy or None); new stories become their own cluster
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None, None
+        now = time.time() if now is None else now
+        bands = self._bands(signature)
+        with self.lock:
+            self._expire(now)
+            best = None
+            seen = set()
+            for band in bands:
+                for entry in self.buckets.get(band, {}).values():
+                    if entry.key in seen:
+                        continue
+                    seen.add(entry.key)
+                    score = similarity(signature, entry.signature)
+                    if score >= self.threshold and (best is None or score > best[0]):
+                        best = (score, entry)
+            if best:
+                return best[1].cluster, best[1].url
+            cluster = hashlib.blake2b(signature.tobytes(), digest_size=8).hexdigest()
+            entry = _Fingerprint(next(self.keys), signature, cluster, url, now)
+            self.entries.append(entry)
+            for band in bands:
+                self.buckets.setdefault(band, {})[entry.key] = entry
+            return cluster, None
+
+    def _expire(self, now):
+        while self.entries and (self.entries[0].added_at < now - self.window or len(self.entries) > self.max_entries):
+            entry = self.entries.popleft()
+            for band in self._bands(entry.signature):
+                bucket = self.buckets.get(band)
+                if bucket is not None:
+                    bucket.pop(entry.key, None)
+                    if not bucket:
+                        del self.buckets[band]
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,209 @@
+import bisect
+import mmap
+from collections import OrderedDict
+from collections.abc import Sequence
+
+CHUNK_SIZE = 64 * 1024
+MAPPED_CHUNK_BYTES = 256 * 1024
+
+
+class ChunkedDocument:
+    path = None
+    complete = True
+
+    def __init__(self, text='', chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.starts = []
+        self.length = 0
+        self.version = 0
+        self._text = None
+        if text:
+            self.append(text)
+
+    @classmethod
+    def from_chunks(cls, chunks, chunk_size=CHUNK_SIZE):
+        document = cls(chunk_size=chunk_size)
+        for chunk in chunks:
+            document.append(chunk)
+        return document
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def append(self, text):
+        if not text:
+            return
+        self._text = None
+        self.version += 1
+        # Top up a short last chunk before starting new ones so small appends don't fragment the buffer
+        if self.chunks and len(self.chunks[-1]) < self.chunk_size:
+            room = self.chunk_size - len(self.chunks[-1])
+            self.chunks[-1] += text[:room]
+            self.length += len(text[:room])
+            text = text[room:]
+        for i in range(0, len(text), self.chunk_size):
+            piece = text[i:i + self.chunk_size]
+            self.starts.append(self.length)
+            self.chunks.append(piece)
+            self.length += len(piece)
+
+    def ensure(self, end):
+        pass  # Fully in memory already; lazy documents load up to `end` here
+
+    def iter_chunks(self):
+        # Reads the document a chunk at a time without joining it; lazy documents load as they go
+        position = 0
+        while True:
+            piece = self.slice(position, position + self.chunk_size)
+            if not piece:
+                return
+            position += len(piece)
+            yield piece
+
+    def slice(self, start, end):
+        start = max(0, start)
+        end = min(end, self.length)
+        if start >= end:
+            return ''
+        index = bisect.bisect_right(self.starts, start) - 1
+        pieces = []
+        while index < len(self.chunks) and self.starts[index] < end:
+            chunk_start = self.starts[index]
+            pieces.append(self.chunks[index][max(0, start - chunk_start):end - chunk_start])
+            index += 1
+        return ''.join(pieces)
+
+    def replace_ranges(self, ranges, replacement):
+        # ranges are sorted, non-overlapping (start, end) pairs; chunks without a match are reused as-is
+        if not ranges:
+            return
+        chunks = []
+        range_index = 0
+        index = 0
+        while index < len(self.chunks):
+            chunk = self.chunks[index]
+            chunk_start = self.starts[index]
+            chunk_end = chunk_start + len(chunk)
+            if range_index >= len(ranges) or ranges[range_index][0] >= chunk_end:
+                chunks.append(chunk)
+                index += 1
+                continue
+            pieces = []
+            cursor = chunk_start
+            while range_index < len(ranges) and ranges[range_index][0] < chunk_end:
+                start, end = ranges[range_index]
+                while end > chunk_end:  # Match runs into the next chunk, so edit the two as one
+                    index += 1
+                    chunk += self.chunks[index]
+                    chunk_end += len(self.chunks[index])
+                pieces.append(chunk[cursor - chunk_start:start - chunk_start])
+                pieces.append(replacement)
+                cursor = end
+                range_index += 1
+            pieces.append(chunk[cursor - chunk_start:])
+            chunks.append(''.join(pieces))
+            index += 1
+
+        self.chunks = [chunk for chunk in chunks if chunk]
+        self.starts = []
+        self.length = 0
+        for chunk in self.chunks:
+            self.starts.append(self.length)
+            self.length += len(chunk)
+        self._text = None
+        self.version += 1
+        self.path = None  # Edited, so the file on disk no longer matches what is shown
+
+    def text(self):
+        # Joined once and reused until the next edit
+        if self._text is None:
+            self._text = ''.join(self.chunks)
+        return self._text
+
+
+class StreamingDocument(ChunkedDocument):
+    # Pulls text from a generator only as far as the reader has paged
+    def __init__(self, source, path=None, chunk_size=CHUNK_SIZE):
+        super().__init__(chunk_size=chunk_size)
+        self.source = iter(source)
+        self.path = path
+        self.complete = False
+
+    def ensure(self, end):
+        while not self.complete and self.length < end:
+            try:
+                self.append(next(self.source))
+            except StopIteration:
+                self.complete = True
+
+    def slice(self, start, end):
+        self.ensure(end)
+        return super().slice(start, end)
+
+    def text(self):
+        self.ensure(float('inf'))
+        return super().text()
+
+    def replace_ranges(self, ranges, replacement):
+        self.ensure(float('inf'))
+        super().replace_ranges(ranges, replacement)
+
+
+class _MappedChunks(Sequence):
+    def __init__(self, mapped, byte_ranges, encoding, cache_size=8):
+        self.mapped = mapped
+        self.byte_ranges = byte_ranges
+        self.encoding = encoding
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def __len__(self):
+        return len(self.byte_ranges)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.byte_ranges)
+        if not 0 <= index < len(self.byte_ranges):
+            raise IndexError(index)
+        chunk = self.cache.get(index)
+        if chunk is None:
+            start, end = self.byte_ranges[index]
+            chunk = self.mapped[start:end].decode(self.encoding, errors='replace')
+            self.cache[index] = chunk
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(index)
+        return chunk
+
+
+class MappedDocument(ChunkedDocument):
+    # Text file backed by mmap; chunks are decoded on demand and only a few are kept in memory
+    def __init__(self, path, encoding='utf-8', chunk_bytes=MAPPED_CHUNK_BYTES):
+        super().__init__()
+        self.path = path
+        with open(path, 'rb') as file:
+            self.mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self.mapped)
+        byte_ranges = []
+        position = 0
+        while position < size:
+            # Back off UTF-8 continuation bytes so no character straddles two chunks
+            end = min(position + chunk_bytes, size)
+            while position < end < size and self.mapped[end] & 0xC0 == 0x80:
+                end -= 1
+            byte_ranges.append((position, end))
+            position = end
+        self.chunks = _MappedChunks(self.mapped, byte_ranges, encoding)
+        # One streaming decode pass to learn character offsets; decoded text is not kept
+        for start, end in byte_ranges:
+            self.starts.append(self.length)
+            self.length += len(self.mapped[start:end].decode(encoding, errors='replace'))
+
+    def text(self):
+        # Not cached: keeping the decoded copy would undo the point of mapping the file
+        return ''.join(self.chunks)
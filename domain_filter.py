@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FILTER_PATH = os.path.join(os.path.expanduser('~'), '.jlt', 'domain_filter.json')
+DEFAULT_BLOCK_TTL = 6 * 3600
+BLOCKED, ALLOWED = 'blocked', 'allowed'
+# Common multi-label public suffixes; anything else is treated as a single-label TLD
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk', 'me.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.nz', 'org.nz', 'co.jp', 'ne.jp', 'or.jp', 'co.kr', 'co.in', 'net.in', 'org.in',
+    'com.br', 'com.cn', 'com.hk', 'com.sg', 'com.tw', 'com.mx', 'com.ar', 'com.tr', 'co.za', 'co.il',
+}
+
+
+def url_host(url):
+    try:
+        host = urlparse(url if '//' in url else '//' + url).hostname
+    except ValueError:
+        return None
+    return host.rstrip('.') if host else None
+
+
+def registrable_domain(host):
+    # "news.bbc.co.uk" -> "bbc.co.uk", "www.reuters.com" -> "reuters.com"; IPs are returned as-is
+    if not host or host.replace('.', '').isdigit() or ':' in host:
+        return host
+    labels = host.split('.')
+    suffix_labels = 2 if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 1
+    return '.'.join(labels[-(suffix_labels + 1):])
+
+
+@contextmanager
+def _file_lock(path):
+    # Serializes read-merge-write of the filter file between processes
+    with open(path, 'a+b') as file:
+        if fcntl:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(file, fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _Rule:
+    def __init__(self, status, expires=None, reason=''):
+        self.status = status
+        self.expires = expires  # Epoch seconds, None = permanent
+        self.reason = reason
+
+    def expired(self, now):
+        return self.expires is not None and self.expires <= now
+
+
+class DomainTrie:
+    # Labels stored right to left, so a rule on "example.com" covers every subdomain of it
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, domain, rule):
+        node = self.root
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        node[None] = rule
+
+    def remove(self, domain):
+        node = self.root
+        for label in reversed(domain.split('.')):
+            node = node.get(label)
+            if node is None:
+                return False
+        return node.pop(None, None) is not None
+
+    def match(self, host, now):
+        # Most specific live rule wins; expired rules found on the way are dropped
+        node = self.root
+        found = None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            rule = node.get(None)
+            if rule is not None:
+                if rule.expired(now):
+                    del node[None]
+                else:
+                    found = rule
+        return found
+
+    def items(self, node=None, labels=()):
+        node = self.root if node is None else node
+        for label, child in node.items():
+            if label is None:
+                yield '.'.join(reversed(labels)), child
+            else:
+                yield from self.items(child, labels + (label,))
+
+
+def _apply(trie, domain, rule):
+    if rule is None:
+        return trie.remove(domain)
+    trie.insert(domain, rule)
+    return True
+
+
+class DomainFilter:
+    # Shared, persisted allow/block rules by registrable domain; blocks expire after a TTL.
+    # `allowed` domains (and their subdomains) always win: they are never blocked and never persisted.
+    def __init__(self, path=DEFAULT_FILTER_PATH, block_ttl=DEFAULT_BLOCK_TTL, allowed=()):
+        self.path = path
+        self.block_ttl = block_ttl
+        self.allowed = {domain.lower() for domain in allowed}
+        self.lock = threading.Lock()
+        self.trie = self._load()
+
+    def status(self, url):
+        host = url_host(url)
+        if host is None:
+            return None
+        with self.lock:
+            rule = self.trie.match(host, time.time())
+        return rule.status if rule else None
+
+    def is_blocked(self, url):
+        return self.status(url) == BLOCKED
+
+    def block(self, url, ttl=None, reason='', whole_site=True):
+        host = url_host(url)
+        if host is None:
+            return None
+        domain = registrable_domain(host) if whole_site else host
+        if self.is_seeded(domain):
+            log.info("Not blocking always-allowed domain %s", domain, extra={'domain': domain})
+            return None
+        ttl = self.block_ttl if ttl is None else ttl
+        self._update(domain, _Rule(BLOCKED, time.time() + ttl if ttl else None, reason))
+        return domain
+
+    def allow(self, domain):
+        self._update(domain.lower(), _Rule(ALLOWED))
+
+    def remove(self, domain):
+        domain = domain.lower()
+        return not self.is_seeded(domain) and self._update(domain, None)
+
+    def is_seeded(self, domain):
+        return any(domain == allowed or domain.endswith('.' + allowed) for allowed in self.allowed)
+
+    def rules(self):
+        now = time.time()
+        with self.lock:
+            return {domain: {'status': rule.status, 'expires': rule.expires, 'reason': rule.reason}
+                    for domain, rule in self.trie.items() if not rule.expired(now)}
+
+    def _update(self, domain, rule):
+        # Applies one change on top of the rules currently on disk, so rules saved by other
+        # processes since we loaded are merged instead of overwritten. rule=None removes.
+        with self.lock:
+            if not self.path:
+                return _apply(self.trie, domain, rule)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with _file_lock(self.path + '.lock'):
+                trie = self._load()
+                changed = _apply(trie, domain, rule)
+                if changed:
+                    self._save(trie)
+            self.trie = trie
+            return changed
+
+    def _load(self):
+        trie = DomainTrie()
+        saved = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    saved = json.load(file)
+            except (OSError, ValueError) as e:
+                log.warning("Ignoring unreadable domain filter %s: %s", self.path, e)
+        now = time.time()
+        for domain, entry in saved.items():
+            rule = _Rule(entry['status'], entry.get('expires'), entry.get('reason', ''))
+            if not rule.expired(now) and not self.is_seeded(domain):
+                trie.insert(domain, rule)
+        for domain in self.allowed:
+            trie.insert(domain, _Rule(ALLOWED))
+        return trie
+
+    def _save(self, trie):
+        now = time.time()
+        rules = {domain: {'status': rule.status, 'expires': rule.expires, 'reason': rule.reason}
+                 for domain, rule in trie.items() if not rule.expired(now) and not self.is_seeded(domain)}
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(rules, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_filter(allowed=()):
+    # One filter per process so every scraper, watchlist job and batch worker sees the same blocks
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DomainFilter(allowed=allowed)
+        return _shared
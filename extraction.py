@@ -0,0 +1,197 @@
+import re
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+BOT_DETECTION = re.compile(r'bot detection|captcha', re.I)
+WORD = re.compile(r'\w+')
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+             'track', 'wbr'}
+NO_TEXT_TAGS = {'script', 'style', 'template'}
+# Start tags that implicitly close an open <p>
+CLOSES_PARAGRAPH = {'address', 'article', 'aside', 'blockquote', 'div', 'dl', 'fieldset', 'figure', 'footer',
+                    'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p',
+                    'pre', 'section', 'table', 'ul'}
+
+
+class TableCell:
+    def __init__(self, text, colspan=1, rowspan=1, header=False):
+        self.text = text
+        self.colspan = colspan
+        self.rowspan = rowspan
+        self.header = header
+
+
+class Table:
+    def __init__(self, html, rows):
+        self.html = html
+        self.rows = rows
+
+
+class Document:
+    def __init__(self, source, text, elements, tables, bot_detected, login_form):
+        self.source = source
+        self.text = text
+        self.elements = elements
+        self.tables = tables
+        self.bot_detected = bot_detected
+        self.login_form = login_form
+        self._tokens = None
+
+    def element_texts(self, tag):
+        tag = tag.lower()
+        return [self.text[start:end] for name, start, end in self.elements if name == tag]
+
+    @property
+    def paragraphs(self):
+        return self.element_texts('p')
+
+    @property
+    def summary(self):
+        return ' '.join(self.paragraphs)
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = WORD.findall(self.text)
+        return self._tokens
+
+    @property
+    def blocked(self):
+        return self.bot_detected or self.login_form
+
+
+class _Extractor(HTMLParser):
+    def __init__(self, source):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_starts = None
+        self.chunks = []
+        self.length = 0
+        self.stack = []  # (tag, text offset, element index)
+        self.elements = []
+        self.skip_text = 0
+        self.tables = []  # Open tables, innermost last: [source offset, rows, open cell]
+        self.finished_tables = []
+        self.bot_detected = False
+        self.login_form = False
+
+    def _source_offset(self):
+        if self.line_starts is None:
+            self.line_starts = [0] + [m.end() for m in re.finditer('\n', self.source)]
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in CLOSES_PARAGRAPH and self._open('p', stop_at='table'):
+            self._close('p')
+        if tag == 'form' and dict(attrs).get('id') == 'login':
+            self.login_form = True
+        if tag == 'table':
+            self.tables.append([self._source_offset(), [], None])
+        elif self.tables and tag == 'tr':
+            self._close_cell()
+            self.tables[-1][1].append([])
+        elif self.tables and tag in ('td', 'th'):
+            self._close_cell()
+            if not self.tables[-1][1]:
+                self.tables[-1][1].append([])
+            attrs = dict(attrs)
+            self.tables[-1][2] = (len(self.chunks), _span(attrs.get('colspan')), _span(attrs.get('rowspan')),
+                                  tag == 'th')
+        if tag in VOID_TAGS:
+            self.elements.append((tag, self.length, self.length))
+            return
+        if tag in NO_TEXT_TAGS:
+            self.skip_text += 1
+        self.stack.append((tag, self.length, len(self.elements)))
+        self.elements.append(None)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._close(tag)
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th') and self.tables:
+            self._close_cell()
+        elif tag == 'table' and self.tables:
+            self._close_cell()
+            start, rows, _ = self.tables.pop()
+            end = self.source.find('>', self._source_offset()) + 1 or len(self.source)
+            self.finished_tables.append(Table(self.source[start:end], [row for row in rows if row]))
+        if self._open(tag):
+            self._close(tag)
+
+    def handle_data(self, data):
+        if self.skip_text:
+            return
+        if not self.bot_detected and BOT_DETECTION.search(data):
+            self.bot_detected = True
+        self.chunks.append(data)
+        self.length += len(data)
+
+    def _open(self, tag, stop_at=None):
+        for name, _, _ in reversed(self.stack):
+            if name == tag:
+                return True
+            if name == stop_at:
+                return False
+        return False
+
+    def _close(self, tag):
+        # Pop up to and including the nearest open element with this tag
+        while self.stack:
+            name, start, index = self.stack.pop()
+            self.elements[index] = (name, start, self.length)
+            if name in NO_TEXT_TAGS:
+                self.skip_text -= 1
+            if name == tag:
+                break
+
+    def _close_cell(self):
+        table = self.tables[-1]
+        if table[2] is None:
+            return
+        first_chunk, colspan, rowspan, header = table[2]
+        table[1][-1].append(TableCell(''.join(self.chunks[first_chunk:]).strip(), colspan, rowspan, header))
+        table[2] = None
+
+    def document(self):
+        self.close()
+        while self.stack:
+            self._close(self.stack[-1][0])
+        while self.tables:
+            self.handle_endtag('table')
+        elements = [element for element in self.elements if element is not None]
+        return Document(self.source, ''.join(self.chunks), elements, self.finished_tables, self.bot_detected,
+                        self.login_form)
+
+
+def _span(value):
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+CACHE_SIZE = 32
+
+
+def parse_document(html):
+    with _cache_lock:
+        document = _cache.get(html)
+        if document is not None:
+            _cache.move_to_end(html)
+            return document
+    extractor = _Extractor(html)
+    extractor.feed(html)
+    document = extractor.document()
+    with _cache_lock:
+        _cache[html] = document
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return document
@@ -0,0 +1,160 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from metrics import FETCH_ACTIVE, FETCH_QUEUE, FETCH_RETRIES
+from transport import RetryLater, TransportStats
+
+log = logging.getLogger(__name__)
+BUSY_POLL = 0.1  # Recheck a domain that is at its concurrency cap this often
+
+
+def url_domain(url):
+    domain = urlparse(url).netloc.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def take(self, now):
+        # Returns 0 and spends a token, or the seconds until one will be available
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class DomainLimiter:
+    # Per-domain token buckets plus a concurrency cap; never sleeps, callers are told how long to wait
+    def __init__(self, max_per_domain=2, rate=1.0, burst=2, jitter=1.0, overrides=None):
+        self.max_per_domain = max_per_domain
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.overrides = overrides or {}  # domain -> (rate, burst) for hosts that need gentler or faster limits
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.active = {}
+
+    def _bucket(self, domain):
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            rate, burst = self.overrides.get(domain, (self.rate, self.burst))
+            bucket = self.buckets[domain] = TokenBucket(rate, burst)
+        return bucket
+
+    def try_acquire(self, domain):
+        with self.lock:
+            if self.active.get(domain, 0) >= self.max_per_domain:
+                return BUSY_POLL
+            delay = self._bucket(domain).take(time.monotonic())
+            if delay:
+                return delay + random.uniform(0, self.jitter)
+            self.active[domain] = self.active.get(domain, 0) + 1
+            return 0.0
+
+    def release(self, domain):
+        with self.lock:
+            self.active[domain] -= 1
+
+    def defer(self, domain, delay):
+        # Retry-After (or backoff) applies to the whole domain, not just the URL that hit it
+        with self.lock:
+            bucket = self._bucket(domain)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+
+
+class ConcurrentFetcher:
+    def __init__(self, max_workers=8, max_per_domain=2, rate=1.0, burst=2, jitter=1.0, max_retries=3, backoff=2.0,
+                 overrides=None, stats=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self.limiter = DomainLimiter(max_per_domain, rate, burst, jitter, overrides)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stats = stats or TransportStats()
+
+    def fetch_unordered(self, urls, fetch, stop_event=None):
+        # Dispatches from this generator's thread: URLs wait in a heap until their domain has a token,
+        # so worker threads only ever run fetches, never sleeps or retry backoffs.
+        # Setting stop_event ends the generator even while every URL is parked behind a Retry-After.
+        if stop_event is None:
+            stop_event = threading.Event()
+        pending = [(0.0, index, url, 0) for index, url in enumerate(urls)]  # (ready at, order, url, attempt)
+        heapq.heapify(pending)
+        order = len(pending)
+        running = {}
+        FETCH_QUEUE.inc(amount=len(pending))  # Shared gauges: several fetchers may be running at once
+        try:
+            while (pending or running) and not stop_event.is_set():
+                now = time.monotonic()
+                deferred = []
+                while pending and pending[0][0] <= now:
+                    _, index, url, attempt = heapq.heappop(pending)
+                    delay = self.limiter.try_acquire(url_domain(url))
+                    if delay:
+                        deferred.append((now + delay, index, url, attempt))
+                    else:
+                        running[self.executor.submit(fetch, url)] = (url, attempt)
+                        FETCH_QUEUE.dec()
+                        FETCH_ACTIVE.inc()
+                for item in deferred:
+                    heapq.heappush(pending, item)
+
+                timeout = max(pending[0][0] - time.monotonic(), 0.0) if pending else None
+                if not running:
+                    stop_event.wait(timeout)
+                    continue
+                if stop_event.is_set():
+                    break
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, attempt = running.pop(future)
+                    FETCH_ACTIVE.dec()
+                    domain = url_domain(url)
+                    self.limiter.release(domain)
+                    try:
+                        result = future.result()
+                    except RetryLater as e:
+                        self.stats.record_throttle(domain)
+                        if attempt >= self.max_retries:
+                            log.warning("Giving up on URL %s after %d attempts: %s", url, attempt + 1, e,
+                                        extra={'url': url, 'domain': domain})
+                            continue
+                        delay = e.retry_after if e.retry_after is not None else self.backoff * 2 ** attempt
+                        self.limiter.defer(domain, delay)
+                        self.stats.record_retry(domain, delay)
+                        FETCH_RETRIES.inc(domain)
+                        heapq.heappush(pending, (time.monotonic() + delay, order, url, attempt + 1))
+                        FETCH_QUEUE.inc()
+                        order += 1
+                        continue
+                    except Exception as e:
+                        log.warning("Fetch failed for URL %s: %s", url, e, extra={'url': url, 'domain': domain})
+                        continue
+                    yield url, result
+        finally:
+            # Drop queued fetches if the consumer stops early; domain slots are freed once each one settles
+            FETCH_QUEUE.dec(amount=len(pending))
+            FETCH_ACTIVE.dec(amount=len(running))
+            for future, (url, _) in running.items():
+                future.cancel()
+                future.add_done_callback(lambda _, domain=url_domain(url): self.limiter.release(domain))
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,86 @@
+import re
+
+from document_buffer import ChunkedDocument, MappedDocument, StreamingDocument
+
+CSV_CHUNK_ROWS = 5000
+TEXT_BLOCK_CHARS = 1 << 20
+WORD = re.compile(r'\w+')
+
+
+def iter_csv_text(path, chunk_rows=CSV_CHUNK_ROWS):
+    import pandas as pd
+
+    # Column widths from the first chunk keep later pages aligned with the header
+    col_space = None
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        if col_space is None:
+            col_space = {column: _column_width(column, chunk[column]) for column in chunk.columns}
+            yield chunk.to_string(col_space=col_space) + '\n'
+        else:
+            yield chunk.to_string(col_space=col_space, header=False) + '\n'
+
+
+def _column_width(column, values):
+    # Empty cells are NaN (and a header-only file has no rows), so measure them as blank text
+    width = values.fillna('').astype(str).str.len().max() if len(values) else 0
+    return max(len(str(column)), int(width))
+
+
+def open_document(path):
+    if path.endswith('.csv'):
+        return StreamingDocument(iter_csv_text(path), path=path)
+    try:
+        return MappedDocument(path)
+    except ValueError:
+        return ChunkedDocument()  # Empty files cannot be memory-mapped
+
+
+def iter_text_blocks(path, block_chars=TEXT_BLOCK_CHARS):
+    if path.endswith('.csv'):
+        import pandas as pd
+
+        for chunk in pd.read_csv(path, chunksize=CSV_CHUNK_ROWS, dtype=str):
+            yield ' '.join(chunk.fillna('').to_numpy().ravel().tolist())
+        return
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        yield from _word_aligned(iter(lambda: file.read(block_chars), ''))
+
+
+def iter_document_blocks(document):
+    # The loaded (possibly edited) document a chunk at a time, never joined into one string
+    return _word_aligned(document.iter_chunks())
+
+
+def _word_aligned(blocks):
+    tail = ''
+    for block in blocks:
+        # Carry a trailing partial word over to the next block
+        block = tail + block
+        cut = max(block.rfind(' '), block.rfind('\n'))
+        if cut == -1:
+            tail = block
+            continue
+        tail = block[cut + 1:]
+        yield block[:cut + 1]
+    if tail:
+        yield tail
+
+
+def iter_tokens(blocks):
+    for block in blocks:
+        yield WORD.findall(block)
+
+
+def stream_sentiment(path, scorer=None):
+    return token_sentiment(iter_tokens(iter_text_blocks(path)), scorer)
+
+
+def token_sentiment(token_blocks, scorer=None):
+    from sentiment import BatchSentimentScorer
+
+    scorer = scorer or BatchSentimentScorer()
+    totals = {bucket: 0 for bucket in range(1, 6)}
+    for tokens in token_blocks:
+        for bucket, count in scorer.distribution(tokens).items():
+            totals[bucket] += count
+    return totals
@@ -0,0 +1,185 @@
+import atexit
+import csv
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.jlt', 'history.sqlite')
+EXPORT_COLUMNS = ("Time", "Ticker", "Title", "URL", "Summary", "Positive Words", "Negative Words",
+                  "Overall Sentiment", "Compound", "Sentiment Scores", "Cluster", "Duplicate")
+SCORE_BUCKETS = 5  # 1 = extremely negative ... 5 = extremely positive
+SCORES = struct.Struct(f'<{SCORE_BUCKETS}I')
+
+
+def pack_scores(counts):
+    # Bucket distribution as five little-endian uint32 counts instead of one score per word
+    return SCORES.pack(*(int(counts.get(bucket, 0)) for bucket in range(1, SCORE_BUCKETS + 1)))
+
+
+def unpack_scores(blob):
+    return dict(zip(range(1, SCORE_BUCKETS + 1), SCORES.unpack(blob)))
+
+
+def sentiment_words(sentiment):
+    positive = [word for word, score in sentiment.items() if score > 0.05]
+    negative = [word for word, score in sentiment.items() if score < -0.05]
+    return ', '.join(positive), ', '.join(negative)
+
+
+class HistoryStore:
+    # Append-only history of scraped articles and sentiment runs; rows are buffered and written in batches
+    def __init__(self, path=DEFAULT_HISTORY_PATH, batch_size=200, flush_interval=2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)  # Empty for ':memory:' and bare file names
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            created_at REAL,
+            ticker TEXT,
+            title TEXT,
+            url TEXT,
+            summary TEXT,
+            pos REAL,
+            neu REAL,
+            neg REAL,
+            compound REAL,
+            overall_sentiment TEXT,
+            scores BLOB,
+            cluster TEXT,
+            duplicate INTEGER DEFAULT 0)''')
+        # Stores created before near-duplicate clustering lack the last two columns
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(history)')}
+        for column, definition in (('cluster', 'TEXT'), ('duplicate', 'INTEGER DEFAULT 0')):
+            if column not in existing:
+                self.conn.execute(f'ALTER TABLE history ADD COLUMN {column} {definition}')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS history_cluster ON history (cluster)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS history_ticker ON history (ticker, created_at)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS history_created ON history (created_at)')
+        self.conn.commit()
+        atexit.register(self.close)
+
+    def add_article(self, ticker, title, url, summary, sentiment, overall_sentiment, cluster=None, duplicate=False):
+        self._append((time.time(), ticker, title, url, summary, sentiment.get('pos'), sentiment.get('neu'),
+                      sentiment.get('neg'), sentiment.get('compound'), overall_sentiment, None, cluster,
+                      int(duplicate)))
+
+    def add_distribution(self, title, url, summary, counts, overall_sentiment, ticker=''):
+        self._append((time.time(), ticker, title, url, summary, None, None, None, None, str(overall_sentiment),
+                      pack_scores(counts), None, 0))
+
+    def _append(self, row):
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size or time.time() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        self.last_flush = time.time()
+        if not self.pending or self.conn is None:
+            return
+        self.conn.executemany('INSERT INTO history (created_at, ticker, title, url, summary, pos, neu, neg, '
+                              'compound, overall_sentiment, scores, cluster, duplicate) '
+                              'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                              self.pending)
+        self.conn.commit()
+        self.pending = []
+
+    def count(self, ticker=None):
+        where, params = self._filters(ticker, None, None)
+        with self.lock:
+            self._flush()
+            return self.conn.execute(f'SELECT COUNT(*) FROM history{where}', params).fetchone()[0]
+
+    def query(self, ticker=None, since=None, until=None, newest_first=False, page_size=1000):
+        # Keyset pages on id so a long export never holds a cursor (or the lock) between pages
+        where, params = self._filters(ticker, since, until)
+        order = 'DESC' if newest_first else 'ASC'
+        last_id = None
+        while True:
+            clause = where
+            page_params = list(params)
+            if last_id is not None:
+                clause += (' AND ' if clause else ' WHERE ') + ('id < ?' if newest_first else 'id > ?')
+                page_params.append(last_id)
+            with self.lock:
+                self._flush()
+                rows = self.conn.execute(f'SELECT id, created_at, ticker, title, url, summary, pos, neu, neg, '
+                                         f'compound, overall_sentiment, scores, cluster, duplicate '
+                                         f'FROM history{clause} ORDER BY id {order} LIMIT ?',
+                                         page_params + [page_size]).fetchall()
+            for row in rows:
+                yield self._entry(row)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def _filters(ticker, since, until):
+        conditions = []
+        params = []
+        if ticker:
+            conditions.append('ticker = ?')
+            params.append(ticker)
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('created_at < ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+    @staticmethod
+    def _entry(row):
+        (_, created_at, ticker, title, url, summary, pos, neu, neg, compound, overall_sentiment, scores, cluster,
+         duplicate) = row
+        sentiment = {key: value for key, value in (('pos', pos), ('neu', neu), ('neg', neg), ('compound', compound))
+                     if value is not None}
+        positive_words, negative_words = sentiment_words(sentiment)
+        return {
+            "Time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created_at)),
+            "Ticker": ticker,
+            "Title": title,
+            "URL": url,
+            "Summary": summary,
+            "Positive Words": positive_words,
+            "Negative Words": negative_words,
+            "Overall Sentiment": overall_sentiment,
+            "Compound": compound,
+            "Sentiment Scores": json.dumps(unpack_scores(scores)) if scores else '',
+            "Cluster": cluster or '',
+            "Duplicate": bool(duplicate),
+        }
+
+    def export_csv(self, path, **filters):
+        # Rows are streamed straight from the database to the file
+        rows = 0
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for entry in self.query(**filters):
+                writer.writerow(entry)
+                rows += 1
+        return rows
+
+    def close(self):
+        with self.lock:
+            if self.conn is None:
+                return
+            self._flush()
+            self.conn.close()
+            self.conn = None
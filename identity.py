@@ -0,0 +1,133 @@
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+SUCCESS, FAILURE, BLOCKED = 'success', 'failure', 'blocked'
+
+
+class IdentityHealth:
+    def __init__(self, value, alpha):
+        self.value = value
+        self.alpha = alpha
+        self.latency = None  # EWMA seconds
+        self.success_rate = 1.0  # EWMA, optimistic so new entries get tried
+        self.captcha_rate = 0.0  # EWMA
+        self.requests = 0
+        self.failures = 0
+        self.captchas = 0
+        self.consecutive_failures = 0
+        self.quarantines = 0
+        self.quarantined_until = 0.0
+
+    def record(self, outcome, latency):
+        alpha = self.alpha
+        self.requests += 1
+        if latency is not None:
+            self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        self.success_rate = alpha * (outcome != FAILURE) + (1 - alpha) * self.success_rate
+        self.captcha_rate = alpha * (outcome == BLOCKED) + (1 - alpha) * self.captcha_rate
+        self.failures += outcome == FAILURE
+        self.captchas += outcome == BLOCKED
+
+    def weight(self, default_latency):
+        health = max(self.success_rate * (1 - self.captcha_rate), 0.01)
+        return health / max(self.latency if self.latency is not None else default_latency, 0.05)
+
+    def stats(self, now):
+        return {'value': self.value, 'requests': self.requests, 'failures': self.failures, 'captchas': self.captchas,
+                'latency': round(self.latency, 3) if self.latency is not None else None,
+                'success_rate': round(self.success_rate, 3), 'captcha_rate': round(self.captcha_rate, 3),
+                'quarantined_for': round(max(self.quarantined_until - now, 0.0), 1)}
+
+
+class IdentityPool:
+    # Weighted by health; entries that keep failing sit out for base * 2**n seconds (capped)
+    def __init__(self, values, alpha=0.2, quarantine_after=2, base_quarantine=30.0, max_quarantine=1800.0,
+                 quarantine_blocked=True):
+        self.entries = [IdentityHealth(value, alpha) for value in values]
+        self.quarantine_after = quarantine_after
+        self.base_quarantine = base_quarantine
+        self.max_quarantine = max_quarantine
+        self.quarantine_blocked = quarantine_blocked
+        self.lock = threading.Lock()
+
+    def choose(self):
+        if not self.entries:
+            return None
+        now = time.monotonic()
+        with self.lock:
+            available = [entry for entry in self.entries if entry.quarantined_until <= now]
+            if not available:
+                # Everything is sitting out; use whichever comes back first rather than stalling
+                return min(self.entries, key=lambda entry: entry.quarantined_until).value
+            known = [entry.latency for entry in available if entry.latency is not None]
+            default_latency = sum(known) / len(known) if known else 1.0
+            weights = [entry.weight(default_latency) for entry in available]
+        return random.choices(available, weights)[0].value
+
+    def record(self, value, outcome, latency=None):
+        with self.lock:
+            entry = next((entry for entry in self.entries if entry.value == value), None)
+            if entry is None:
+                return
+            entry.record(outcome, latency)
+            if outcome == SUCCESS:
+                entry.consecutive_failures = 0
+                entry.quarantines = 0
+                return
+            if outcome == BLOCKED and not self.quarantine_blocked:
+                return
+            entry.consecutive_failures += 1
+            if entry.consecutive_failures >= self.quarantine_after:
+                delay = min(self.base_quarantine * 2 ** entry.quarantines, self.max_quarantine)
+                entry.quarantined_until = time.monotonic() + delay
+                entry.quarantines += 1
+                entry.consecutive_failures = 0
+                log.warning("Quarantined %s for %.0fs", entry.value, delay,
+                            extra={'identity': entry.value, 'quarantine': delay})
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            return [entry.stats(now) for entry in self.entries]
+
+
+class Identity:
+    def __init__(self, proxy, user_agent):
+        self.proxy = proxy
+        self.user_agent = user_agent
+
+    def proxies(self):
+        return {"http": self.proxy, "https": self.proxy} if self.proxy else None
+
+
+class IdentityManager:
+    # Proxies are quarantined when they fail or get flagged; user agents are only down-weighted
+    def __init__(self, proxies, user_agents, **options):
+        self.proxies = IdentityPool(proxies, **options)
+        self.user_agents = IdentityPool(user_agents, quarantine_blocked=False, quarantine_after=float('inf'))
+
+    def choose(self):
+        return Identity(self.proxies.choose(), self.user_agents.choose())
+
+    def record(self, identity, outcome, latency=None):
+        if identity.proxy:
+            self.proxies.record(identity.proxy, outcome, latency)
+        # A dead proxy says nothing about the user agent
+        if outcome != FAILURE:
+            self.user_agents.record(identity.user_agent, outcome)
+
+    def stats(self):
+        return {'proxies': self.proxies.stats(), 'user_agents': self.user_agents.stats()}
+
+    def summary(self):
+        lines = [f"{'Identity':50} {'Requests':>8} {'Success':>7} {'Captcha':>7} {'Latency':>8} {'Quarantine':>10}"]
+        for kind in ('proxies', 'user_agents'):
+            for entry in self.stats()[kind]:
+                latency = f"{entry['latency']:.2f}s" if entry['latency'] is not None else '-'
+                lines.append(f"{entry['value'][:50]:50} {entry['requests']:>8} {entry['success_rate']:>7.0%} "
+                             f"{entry['captcha_rate']:>7.0%} {latency:>8} {entry['quarantined_for']:>9.0f}s")
+        return '\n'.join(lines)
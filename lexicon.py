@@ -0,0 +1,18 @@
+import os
+
+LEXICON_DIR = os.path.join(os.path.expanduser('~'), '.jlt', 'nltk_data')
+
+
+def make_analyzer():
+    import nltk
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+    if LEXICON_DIR not in nltk.data.path:
+        nltk.data.path.append(LEXICON_DIR)
+    # Only hit the network the first time; afterwards the lexicon loads from the local cache
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        os.makedirs(LEXICON_DIR, exist_ok=True)
+        nltk.download('vader_lexicon', download_dir=LEXICON_DIR, quiet=True)
+    return SentimentIntensityAnalyzer()
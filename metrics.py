@@ -0,0 +1,332 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_METRICS_PORT = 9464
+DEFAULT_DUMP_PATH = os.path.join(os.path.expanduser('~'), '.jlt', 'metrics.json')
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}  # Label values tuple -> sample
+        self.lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            return list(self.values.items())
+
+    def render(self):
+        return self.header() + [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                                for key, value in self.samples()]
+
+    def snapshot(self):
+        return [{'labels': dict(zip(self.labels, key)), 'value': value} for key, value in self.samples()]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def __init__(self, name, help, labels=(), function=None):
+        super().__init__(name, help, labels)
+        self.function = function  # Unlabelled gauges can be read on demand instead of set
+
+    def set(self, value, *labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        if self.function is not None:
+            return [((), self.function())]
+        return super().samples()
+
+
+class _HistogramSample:
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self.lock:
+            sample = self.values.get(key)
+            if sample is None:
+                sample = self.values[key] = _HistogramSample(self.buckets)
+            sample.counts[index] += 1
+            sample.sum += value
+            sample.count += 1
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        # (labels, cumulative bucket counts, sum, count), copied under the lock
+        with self.lock:
+            samples = [(key, list(sample.counts), sample.sum, sample.count) for key, sample in self.values.items()]
+        result = []
+        for key, counts, total, count in samples:
+            cumulative = []
+            running = 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            result.append((key, cumulative, total, count))
+        return result
+
+    def quantile(self, q, cumulative):
+        # Linear interpolation inside the bucket holding the q-th observation, as Prometheus does
+        count = cumulative[-1]
+        if not count:
+            return None
+        rank = q * count
+        lower = 0.0
+        previous = 0
+        for bound, running in zip(self.buckets + (math.inf,), cumulative):
+            if running >= rank:
+                if bound == math.inf:
+                    return self.buckets[-1] if self.buckets else None
+                return lower + (bound - lower) * (rank - previous) / max(running - previous, 1)
+            lower, previous = bound, running
+        return None
+
+    def render(self):
+        lines = self.header()
+        for key, cumulative, total, count in self.samples():
+            for bound, running in zip(self.buckets + (math.inf,), cumulative):
+                labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def snapshot(self):
+        return [{'labels': dict(zip(self.labels, key)), 'count': count, 'sum': round(total, 6),
+                 'p50': self.quantile(0.5, cumulative), 'p95': self.quantile(0.95, cumulative),
+                 'buckets': {_format_value(bound): running
+                             for bound, running in zip(self.buckets + (math.inf,), cumulative)}}
+                for key, cumulative, total, count in self.samples()]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, metric):
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing  # Modules re-imported or registering twice share one series
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name, help, labels=(), function=None):
+        return self._register(Gauge(name, help, labels, function))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self):
+        # Prometheus text exposition format, version 0.0.4
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {'time': time.time(),
+                'metrics': {metric.name: {'type': metric.kind, 'help': metric.help, 'samples': metric.snapshot()}
+                            for metric in metrics}}
+
+
+REGISTRY = MetricsRegistry()
+
+# Hot-path instrumentation shared by every scraper, fetcher and pool in the process
+FETCH_SECONDS = REGISTRY.histogram('jlt_fetch_seconds', "Time to download a page, by domain", ('domain',))
+FETCH_BYTES = REGISTRY.counter('jlt_fetch_bytes_total', "Bytes downloaded, by domain", ('domain',))
+FETCH_RESPONSES = REGISTRY.counter('jlt_fetch_responses_total', "Fetch outcomes by domain and HTTP status "
+                                   "(\"error\" for connection failures)", ('domain', 'status'))
+FETCH_RETRIES = REGISTRY.counter('jlt_fetch_retries_total', "Fetches rescheduled after 429/5xx, by domain",
+                                 ('domain',))
+CAPTCHAS = REGISTRY.counter('jlt_captchas_total', "Pages answered with bot detection or a sign-in wall, by domain",
+                            ('domain',))
+PARSE_SECONDS = REGISTRY.histogram('jlt_parse_seconds', "Time to parse a fetched page")
+SCORE_SECONDS = REGISTRY.histogram('jlt_score_seconds', "Time to score one article, including pool queueing")
+CACHE_LOOKUPS = REGISTRY.counter('jlt_cache_lookups_total',
+                                 "Article cache lookups, one result each (hit, unscored, miss, stale, not_modified)",
+                                 ('result',))
+ARTICLES = REGISTRY.counter('jlt_articles_total', "Articles handled by outcome (processed, duplicate)",
+                            ('outcome',))
+FETCH_QUEUE = REGISTRY.gauge('jlt_fetch_queue', "URLs waiting for a domain slot or token in the fetchers")
+FETCH_ACTIVE = REGISTRY.gauge('jlt_fetch_active', "Fetches running in fetcher worker threads")
+SCORING_QUEUE = REGISTRY.gauge('jlt_scoring_queue', "Texts waiting to be batched for the scoring pool")
+UI_QUEUE = REGISTRY.gauge('jlt_ui_queue', "Events waiting for the Tk main loop")
+THREADS = REGISTRY.gauge('jlt_threads', "Live Python threads", function=threading.active_count)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            body = self.registry.render().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif path == '/metrics.json':
+            body = json.dumps(self.registry.snapshot()).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("Metrics request: " + format, *args)
+
+
+class MetricsServer:
+    # /metrics (Prometheus text) and /metrics.json, bound to localhost only
+    def __init__(self, port=DEFAULT_METRICS_PORT, host='127.0.0.1', registry=REGISTRY):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True)
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread.start()
+        log.info("Serving metrics on %s", self.address)
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsDumper:
+    # Rewrites a JSON snapshot every `interval` seconds (and once more on stop), atomically like the domain filter
+    def __init__(self, path=DEFAULT_DUMP_PATH, interval=60.0, registry=REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='metrics-dump', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(self.registry.snapshot(), file, indent=1)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            log.warning("Could not write metrics to %s: %s", self.path, e)
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.dump()
+
+
+def start_metrics(port=DEFAULT_METRICS_PORT, dump_path=None, dump_interval=60.0):
+    # Exporters are optional: a busy port is logged and skipped rather than stopping the scraper
+    server = dumper = None
+    if port is not None:
+        try:
+            server = MetricsServer(port).start()
+        except OSError as e:
+            log.warning("Metrics endpoint not started on port %s: %s", port, e)
+    if dump_path:
+        dumper = MetricsDumper(dump_path, dump_interval).start()
+    return server, dumper
@@ -0,0 +1,67 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from metrics import REGISTRY
+
+
+def _format_amount(name, value):
+    if value is None:
+        return '-'
+    if name.endswith('_seconds'):
+        return f"{value * 1000:.1f} ms"
+    if name.endswith('_bytes_total'):
+        return f"{value / 1e6:.2f} MB"
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+
+
+class MetricsPanel:
+    # Every registered metric as a table row, refreshed in place; counters and histograms also show a rate
+    def __init__(self, parent, registry=REGISTRY, interval=1000):
+        self.registry = registry
+        self.interval = interval
+        self.previous = {}  # Row id -> (count, time) from the last refresh
+
+        self.frame = tk.Frame(parent)
+        columns = ("Labels", "Value", "Rate/s")
+        self.tree = ttk.Treeview(self.frame, columns=columns)
+        self.tree.heading('#0', text="Metric")
+        self.tree.column('#0', width=220)
+        for column, width in zip(columns, (240, 320, 80)):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.refresh()
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def refresh(self):
+        if not self.frame.winfo_exists():
+            return
+        now = time.monotonic()
+        for name, metric in self.registry.snapshot()['metrics'].items():
+            for sample in metric['samples']:
+                labels = ', '.join(f"{key}={value}" for key, value in sample['labels'].items())
+                if metric['type'] == 'histogram':
+                    count = sample['count']
+                    mean = sample['sum'] / count if count else None
+                    value = (f"n={count:,}  mean={_format_amount(name, mean)}  "
+                             f"p95={_format_amount(name, sample['p95'])}")
+                else:
+                    count = sample['value']
+                    value = _format_amount(name, count)
+                row = f"{name}|{labels}"
+                rate = ''
+                if metric['type'] != 'gauge' and row in self.previous:
+                    last_count, last_time = self.previous[row]
+                    rate = f"{(count - last_count) / max(now - last_time, 1e-6):,.1f}"
+                self.previous[row] = (count, now)
+                if self.tree.exists(row):
+                    self.tree.item(row, values=(labels, value, rate))
+                else:
+                    self.tree.insert('', tk.END, iid=row, text=name, values=(labels, value, rate))
+        self.frame.after(self.interval, self.refresh)
@@ -0,0 +1,152 @@
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from lexicon import make_analyzer
+from metrics import SCORING_QUEUE
+
+log = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(])')
+MAX_RESUBMITS = 1  # A batch that also breaks the restarted pool fails instead of looping
+
+_analyzer = None  # One VADER instance per worker process, built by the pool initializer
+
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_END.split(text.strip()) if sentence]
+
+
+def _init_worker():
+    global _analyzer
+    _analyzer = make_analyzer()
+
+
+def _score_batch(jobs):
+    # Runs in a worker process: [(text, sentences?)] -> [{'document': scores, 'sentences': [(text, scores)]}]
+    results = []
+    for text, sentences in jobs:
+        result = {'document': _analyzer.polarity_scores(text)}
+        if sentences:
+            result['sentences'] = [(sentence, _analyzer.polarity_scores(sentence))
+                                   for sentence in split_sentences(text)]
+        results.append(result)
+    return results
+
+
+class ScoringPool:
+    # VADER scoring in worker processes so it runs off the GIL. Submissions from any thread are
+    # collected into batches (up to `batch_size`, waiting at most `linger` seconds) and sent as one task.
+    # polarity_scores() makes the pool a drop-in for FinanceScraper's sentiment_analyzer.
+    def __init__(self, workers=None, batch_size=32, linger=0.005):
+        self.workers = workers or os.cpu_count()
+        self.lock = threading.Lock()
+        self.executor = self._new_executor()
+        self.batch_size = batch_size
+        self.linger = linger
+        self.jobs = queue.Queue()
+        self.closed = False
+        self.dispatcher = threading.Thread(target=self._dispatch, name='scoring-dispatch', daemon=True)
+        self.dispatcher.start()
+
+    def _new_executor(self):
+        # spawn, not fork: workers start lazily from a process already running fetch, UI and metrics threads
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, text, sentences=False):
+        if self.closed:
+            raise RuntimeError("Scoring pool is shut down")
+        future = Future()
+        self.jobs.put((text, sentences, future))
+        SCORING_QUEUE.inc()
+        return future
+
+    def polarity_scores(self, text):
+        return self.submit(text).result()['document']
+
+    def map(self, texts, sentences=True):
+        # Keeps at most a few batches in flight so long inputs are streamed, results come back in order
+        pending = deque()
+        window = self.batch_size * (self.workers + 1)
+        for text in texts:
+            pending.append(self.submit(text, sentences))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _dispatch(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            SCORING_QUEUE.dec()
+            batch = [job]
+            try:
+                while len(batch) < self.batch_size:
+                    job = self.jobs.get(timeout=self.linger)
+                    if job is None:
+                        self.jobs.put(None)  # Finish this batch, then stop
+                        break
+                    SCORING_QUEUE.dec()
+                    batch.append(job)
+            except queue.Empty:
+                pass
+            batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+            if batch:
+                self._submit(batch)
+
+    def _submit(self, batch, attempt=0):
+        with self.lock:
+            executor = self.executor
+        try:
+            task = executor.submit(_score_batch, [(text, sentences) for text, sentences, _ in batch])
+        except BrokenProcessPool as e:
+            self._restart(executor, batch, attempt, e)
+            return
+        except RuntimeError as e:  # Executor already shut down
+            _fail(batch, e)
+            return
+        task.add_done_callback(lambda task: self._resolve(task, executor, batch, attempt))
+
+    def _resolve(self, task, executor, batch, attempt):
+        error = task.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._restart(executor, batch, attempt, error)
+        elif error is not None:
+            _fail(batch, error)
+        else:
+            for (_, _, future), result in zip(batch, task.result()):
+                future.set_result(result)
+
+    def _restart(self, executor, batch, attempt, error):
+        # A worker died (killed, out of memory); every later submit would fail, so replace the pool
+        if attempt >= MAX_RESUBMITS or self.closed:
+            _fail(batch, error)
+            return
+        with self.lock:
+            if self.executor is executor:  # Other batches on the same pool see it broken too
+                log.warning("Scoring worker died, restarting the pool: %s", error)
+                self.executor = self._new_executor()
+                executor.shutdown(wait=False)
+        self._submit(batch, attempt + 1)
+
+    def shutdown(self, wait=True):
+        self.closed = True
+        self.jobs.put(None)
+        self.dispatcher.join()
+        with self.lock:
+            executor = self.executor
+        executor.shutdown(wait=wait)
+
+
+def _fail(batch, error):
+    for _, _, future in batch:
+        future.set_exception(error)
@@ -0,0 +1,65 @@
+import bisect
+import re
+from array import array
+
+WORD = re.compile(r'\w+')
+
+
+class DocumentIndex:
+    def __init__(self, document):
+        self.document = document
+        self.version = document.version
+        self.text = document.text()
+        self.results = {}
+        # Lower-cased token -> start offsets, built once per loaded document
+        self.postings = {}
+        for match in WORD.finditer(self.text):
+            token = match.group().lower()
+            starts = self.postings.get(token)
+            if starts is None:
+                starts = self.postings[token] = array('q')
+            starts.append(match.start())
+
+    def is_current(self, document):
+        return document is self.document and document.version == self.version
+
+    def search(self, pattern, regex=False, case_sensitive=False, whole_word=False):
+        key = (pattern, regex, case_sensitive, whole_word)
+        if key not in self.results:
+            if whole_word and not regex and WORD.fullmatch(pattern):
+                hits = self._lookup(pattern, case_sensitive)
+            else:
+                expression = pattern if regex else re.escape(pattern)
+                if whole_word:
+                    expression = rf'\b(?:{expression})\b'
+                flags = 0 if case_sensitive else re.IGNORECASE
+                hits = [(match.start(), match.end())
+                        for match in re.finditer(expression, self.text, flags) if match.end() > match.start()]
+            self.results[key] = hits
+        return self.results[key]
+
+    def _lookup(self, word, case_sensitive):
+        length = len(word)
+        starts = self.postings.get(word.lower(), ())
+        if case_sensitive:
+            return [(start, start + length) for start in starts if self.text[start:start + length] == word]
+        return [(start, start + length) for start in starts]
+
+
+def hits_between(hits, start, end):
+    first = bisect.bisect_left(hits, (start,))
+    # A match that starts just before the window may still overlap it
+    if first > 0 and hits[first - 1][1] > start:
+        first -= 1
+    last = bisect.bisect_left(hits, (end,))
+    return hits[first:last]
+
+
+def next_hit(hits, position, direction=1):
+    if not hits:
+        return None
+    if direction > 0:
+        index = bisect.bisect_right(hits, (position, float('inf')))
+        return hits[index] if index < len(hits) else hits[0]
+    index = bisect.bisect_left(hits, (position,)) - 1
+    return hits[index] if index >= 0 else hits[-1]
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+from lexicon import make_analyzer
+
+# Bucket edges matching the 1-5 scale used by perform_sentiment_analysis:
+# <= -0.6 | (-0.6, -0.2] | (-0.2, 0.2) | [0.2, 0.6) | >= 0.6
+NEGATIVE_EDGES = np.array([-0.6, -0.2])
+POSITIVE_EDGES = np.array([0.2, 0.6])
+
+
+def _booster_words(analyzer):
+    constants = getattr(analyzer, 'constants', None)
+    if constants is not None:
+        return constants.BOOSTER_DICT
+    from nltk.sentiment import vader
+    return vader.BOOSTER_DICT
+
+
+class BatchSentimentScorer:
+    def __init__(self, analyzer=None):
+        self.analyzer = analyzer or make_analyzer()
+        boosters = _booster_words(self.analyzer)
+        # A lone token scores as VADER's normalized lexicon valence; boosters and single characters score 0
+        table = {word: round(valence / math.sqrt(valence * valence + 15), 4)
+                 for word, valence in self.analyzer.lexicon.items()
+                 if word not in boosters and len(word) > 1}
+        words = sorted(table)
+        self.vocab = np.array(words)
+        self.compound = np.array([table[word] for word in words], dtype=np.float64)
+
+    def compound_scores(self, tokens):
+        tokens = np.char.lower(np.asarray(tokens, dtype=str))
+        if not tokens.size:
+            return np.zeros(0)
+        idx = np.minimum(np.searchsorted(self.vocab, tokens), len(self.vocab) - 1)
+        return np.where(self.vocab[idx] == tokens, self.compound[idx], 0.0)
+
+    def bucket_scores(self, tokens):
+        compound = self.compound_scores(tokens)
+        return (np.digitize(compound, NEGATIVE_EDGES, right=True) + np.digitize(compound, POSITIVE_EDGES) + 1)
+
+    def distribution(self, tokens):
+        counts = np.bincount(self.bucket_scores(tokens), minlength=6)[1:]
+        return {bucket: int(count) for bucket, count in enumerate(counts, start=1)}
@@ -0,0 +1,164 @@
+import csv
+import math
+import os
+import re
+from decimal import Decimal
+
+from extraction import Table, parse_document
+
+DIGITS = re.compile(r'\d+(?:\.\d*)?|\.\d+')
+MISSING = {'', '-', '--', '–', '—', 'n/a', 'na', 'nm', 'none', 'null'}
+SCALES = (('bn', 9), ('mm', 6), ('mn', 6), ('k', 3), ('m', 6), ('b', 9), ('t', 12))  # Powers of ten
+CURRENCY = '$€£¥'
+
+
+def parse_number(text):
+    # "(1,234)" -> -1234.0, "$2.5B" -> 2.5e9, "12.5%" -> 0.125, dashes and "N/A" -> nan, text -> None
+    value = text.strip().replace('−', '-')
+    if value.lower() in MISSING:
+        return math.nan
+    negative = False
+    if value.startswith('(') and value.endswith(')'):
+        negative = True
+        value = value[1:-1].strip()
+    for _ in range(2):  # Sign may come before or after the currency symbol
+        if value[:1] in ('-', '+'):
+            negative ^= value[0] == '-'
+            value = value[1:].strip()
+        value = value.lstrip(CURRENCY).strip()
+    exponent = 0
+    if value.endswith('%'):
+        exponent = -2
+        value = value[:-1].strip()
+    else:
+        lowered = value.lower()
+        for suffix, power in SCALES:
+            if lowered.endswith(suffix):
+                exponent = power
+                value = value[:-len(suffix)].strip()
+                break
+    value = value.replace(',', '')
+    if not DIGITS.fullmatch(value):
+        return None
+    # Scale in decimal and round once, so "-2.6%" is -0.026 rather than -0.026000000000000002
+    number = float(Decimal(value).scaleb(exponent))
+    return -number if negative else number
+
+
+def iter_table_rows(table):
+    # Yields one grid row at a time with colspan/rowspan cells repeated into every slot they cover
+    pending = {}  # column -> [rows remaining, text]
+    for row in table.rows:
+        out = []
+        column = 0
+        cells = iter(row)
+        while True:
+            while column in pending:
+                remaining, text = pending[column]
+                out.append(text)
+                if remaining == 1:
+                    del pending[column]
+                else:
+                    pending[column][0] -= 1
+                column += 1
+            cell = next(cells, None)
+            if cell is None:
+                break
+            for _ in range(cell.colspan):
+                out.append(cell.text)
+                if cell.rowspan > 1:
+                    pending[column] = [cell.rowspan - 1, cell.text]
+                column += 1
+        yield out, bool(row) and all(cell.header for cell in row)
+
+
+def _column_names(header, width):
+    names = []
+    seen = {}
+    for index in range(width):
+        name = header[index] if header and index < len(header) and header[index] else f"Column {index + 1}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name} ({seen[name]})"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _typed_columns(rows, width, min_numeric=0.8):
+    # A column is numeric when most of its non-missing cells parse; stray labels then become NaN
+    typed = []
+    for index in range(width):
+        values = [row[index] if index < len(row) else '' for row in rows]
+        numbers = [parse_number(value) for value in values]
+        present = [number for number in numbers if number is None or not math.isnan(number)]
+        parsed = sum(1 for number in present if number is not None)
+        if present and parsed / len(present) >= min_numeric:
+            typed.append([math.nan if number is None else number for number in numbers])
+        elif not present:
+            typed.append(numbers)
+        else:
+            typed.append(values)
+    return typed
+
+
+def table_to_dataframe(table):
+    import pandas as pd
+
+    header = None
+    rows = []
+    for row, is_header in iter_table_rows(table):
+        if is_header and not rows and header is None:
+            header = row
+        else:
+            rows.append(row)
+    width = max([len(row) for row in rows] + [len(header or [])])
+    names = _column_names(header, width)
+    return pd.DataFrame(dict(zip(names, _typed_columns(rows, width))), columns=names)
+
+
+def is_financial_table(table, min_numeric=0.3):
+    cells = [cell.text for row in table.rows for cell in row if not cell.header]
+    if len(table.rows) < 2 or not cells:
+        return False
+    numeric = sum(1 for text in cells if text.strip().lower() not in MISSING and parse_number(text) is not None)
+    return numeric / len(cells) >= min_numeric
+
+
+def extract_tables(html, financial_only=True):
+    tables = parse_document(html).tables
+    if financial_only:
+        tables = [table for table in tables if is_financial_table(table)]
+    return [table_to_dataframe(table) for table in tables]
+
+
+def _csv_value(text):
+    number = parse_number(text)
+    if number is None:
+        return text
+    return '' if math.isnan(number) else number
+
+
+def write_table_csv(table, path):
+    # Streams row by row so very large tables never become a DataFrame
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        for row, is_header in iter_table_rows(table):
+            writer.writerow(row if is_header else [_csv_value(text) for text in row])
+
+
+def export_tables(tables, directory, fmt='csv', prefix='table'):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, table in enumerate(tables, start=1):
+        path = os.path.join(directory, f"{prefix}_{index}.{fmt}")
+        if fmt == 'parquet':
+            frame = table_to_dataframe(table) if isinstance(table, Table) else table
+            frame.to_parquet(path, index=False)
+        elif isinstance(table, Table):
+            write_table_csv(table, path)
+        else:
+            table.to_csv(path, index=False)
+        paths.append(path)
+    return paths
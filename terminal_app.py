@@ -0,0 +1,659 @@
+import tkinter as tk
+from tkinter import filedialog, simpledialog, messagebox, Canvas, ttk
+import pandas as pd
+import requests
+import logging
+import os
+import re
+import threading
+from scrapper import FinanceScraper, PROXIES, USER_AGENTS, overall_sentiment_label
+from identity import IdentityManager
+from transport import RetryLater, TransportStats
+from fetch_engine import ConcurrentFetcher
+from watchlist import WatchlistScheduler
+from article_cache import ArticleCache
+from sentiment import BatchSentimentScorer
+from browser_pool import BrowserPool, make_chrome_driver
+from batch_processor import BatchProcessor, read_url_list
+from scoring_pool import ScoringPool
+from extraction import parse_document
+from table_extract import export_tables, is_financial_table, table_to_dataframe
+from ui_queue import UIEventBus
+from document_buffer import ChunkedDocument, StreamingDocument
+from text_view import RingBufferLog, VirtualTextView
+from search_index import DocumentIndex, hits_between, next_hit
+from file_loader import iter_document_blocks, iter_tokens, open_document, stream_sentiment, token_sentiment
+from history_store import HistoryStore, sentiment_words
+from analytics import SentimentAggregates, count_words
+from dashboard import SentimentDashboard
+from metrics import DEFAULT_DUMP_PATH, DEFAULT_METRICS_PORT, start_metrics
+from metrics_panel import MetricsPanel
+
+log = logging.getLogger(__name__)
+
+# Larger documents are paged and streamed but never joined into one string
+MAX_TEXT_CHARS = 20_000_000
+
+
+class StockScraperApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("JLT Terminal")
+        self.chunk_size = 5000  # Display 5000 characters at a time
+        self.history = HistoryStore()  # Persistent history of URL loads and sentiment analysis
+        self.analytics = SentimentAggregates()  # Rolling per-ticker/per-day stats for the live dashboard
+        self.scraper = None
+        self.url_scraper = None
+        self.scheduler = None
+        self.fetcher = None
+        self.transport_stats = TransportStats()  # Connection reuse and throttling across the watchlist
+        self.identities = IdentityManager(PROXIES, USER_AGENTS)  # Proxy/user-agent health shared by all scrapers
+        self.browser_pool = BrowserPool(lambda: make_chrome_driver(USER_AGENTS))
+        self.sentiment_scorer = None
+        self.scoring_pool = None
+        self.detected_tables = []  # DataFrames from the last Auto-Detect Tables run
+        self.search_index = None
+        self.search_hits = []
+        self.match_position = 0
+
+        self.setup_frames()
+        self.setup_buttons()
+        self.setup_text_display()
+        self.setup_icon()
+
+        # Worker threads never touch Tk directly; they post to this bus, which the main loop drains
+        self.ui = UIEventBus(self.root)
+        self.ui.start()
+
+    # The loaded document lives in the viewer's chunked buffer; only the visible window is rendered
+    @property
+    def text_content(self):
+        self.check_document_size()
+        return self.viewer.document.text()
+
+    @text_content.setter
+    def text_content(self, value):
+        self.viewer.document = ChunkedDocument(value)
+        self.search_hits = []
+
+    def document_too_large(self):
+        document = self.viewer.document
+        document.ensure(MAX_TEXT_CHARS + 1)
+        return len(document) > MAX_TEXT_CHARS
+
+    def check_document_size(self):
+        if self.document_too_large():
+            raise ValueError(f"the document is too large for this ({len(self.viewer.document):,} characters, "
+                             f"limit {MAX_TEXT_CHARS:,})")
+
+    @property
+    def current_position(self):
+        return self.viewer.position
+
+    @current_position.setter
+    def current_position(self, value):
+        self.viewer.position = value
+
+    def setup_frames(self):
+        self.left_frame = tk.Frame(self.root, width=200, relief=tk.RAISED, borderwidth=2, bg='white')
+        self.left_frame.pack(side=tk.LEFT, fill=tk.Y)
+        self.right_frame = tk.Frame(self.root, bg='white')
+        self.right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+
+    def setup_buttons(self):
+        tk.Label(self.left_frame, text="Enter URL or Select File:", bg='white').pack(fill=tk.X, padx=5)
+        self.url_entry = tk.Entry(self.left_frame, width=20)
+        self.url_entry.pack(fill=tk.X, padx=5)
+        self.add_buttons()
+
+    def add_buttons(self):
+        commands = [("Load URL", self.load_from_url), ("Select File", self.load_from_file),
+                    ("Batch Process URLs", self.process_url_list), ("Find and Replace", self.find_replace),
+                    ("Highlight Text", self.highlight_text), ("Unhighlight Text", self.unhighlight_text),
+                    ("Select HTML Elements", self.select_html_elements),
+                    ("Auto-Detect Tables", self.auto_detect_tables), ("Export Tables", self.export_tables),
+                    ("Sentiment Analysis", self.perform_sentiment_analysis), ("Display Words", self.display_words),
+                    ("Show History", self.show_history), ("Start Auto Search", self.start_auto_search),
+                    ("Stop Auto Search", self.stop_auto_search), ("Visualize Sentiment", self.visualize_sentiment),
+                    ("Metrics", self.show_metrics)]
+        for (text, command) in commands:
+            tk.Button(self.left_frame, text=text, command=command, bg='red', fg='white').pack(fill=tk.X, padx=5, pady=5)
+
+    def setup_text_display(self):
+        self.viewer = VirtualTextView(self.right_frame, window=self.chunk_size, wrap=tk.WORD, bg='black', fg='white')
+        self.viewer.pack(fill=tk.BOTH, expand=True)
+        self.text = self.viewer.text
+        self.viewer.on_render = self.apply_highlight
+
+        tk.Label(self.right_frame, text="Auto Search Log", bg='white').pack(fill=tk.X)
+        self.log = RingBufferLog(self.right_frame, height=12, wrap=tk.WORD, bg='black', fg='white')
+        self.log.pack(fill=tk.BOTH)
+
+    def setup_icon(self):
+        canvas = Canvas(self.left_frame, width=20, height=20, bg='white', highlightthickness=0)
+        canvas.pack(side=tk.BOTTOM, pady=10, expand=True)
+
+    def load_from_url(self):
+        url = self.url_entry.get()
+        threading.Thread(target=self.fetch_and_display_url, args=(url,)).start()
+
+    def load_from_file(self):
+        file_path = filedialog.askopenfilename()
+        if file_path:
+            threading.Thread(target=self.read_file, args=(file_path,)).start()
+
+    def fetch_and_display_url(self, url):
+        try:
+            summary = self.get_url_scraper().fetch_with_selenium(url)
+            if summary:
+                self.ui.post(self.show_loaded_url, summary)
+        except RetryLater as e:
+            self.ui.post(messagebox.showerror, "Error", f"Site is rate limiting us, try again later ({e})")
+        except requests.exceptions.RequestException as e:
+            self.ui.post(messagebox.showerror, "Error", f"Failed to load URL: {e}")
+
+    def show_loaded_url(self, summary):
+        self.show_document(summary)
+        self.perform_sentiment_analysis()
+
+    def show_document(self, text_content):
+        self.show_loaded_document(ChunkedDocument(text_content))
+
+    def show_loaded_document(self, document):
+        self.viewer.document = document
+        self.search_hits = []
+        self.current_position = 0
+        self.update_text_display()
+
+    def read_file(self, file_path):
+        try:
+            # CSVs are rendered chunk by chunk and text files memory-mapped, only as far as the viewer pages
+            document = open_document(file_path)
+            document.ensure(self.chunk_size * 2)
+            self.ui.post(self.show_loaded_document, document)
+        except Exception as e:
+            self.ui.post(messagebox.showerror, "Error", f"Failed to read file: {e}")
+
+    def update_text_display(self):
+        if self.viewer.document:
+            self.viewer.show(self.current_position)
+        else:
+            messagebox.showerror("Error", "No content to display.")
+
+    def find_replace(self):
+        word_to_find = simpledialog.askstring("Find and Replace", "Enter word to find:")
+        word_to_replace = simpledialog.askstring("Find and Replace", "Enter word to replace with:")
+
+        if word_to_find and word_to_replace:
+            # Only the chunks containing a match are rebuilt
+            try:
+                hits = self.get_search_index().search(word_to_find, case_sensitive=True)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Cannot replace: {e}")
+                return
+            self.viewer.document.replace_ranges(hits, word_to_replace)
+            self.search_hits = []
+            self.update_text_display()
+
+    def get_search_index(self):
+        document = self.viewer.document
+        if self.search_index is None or not self.search_index.is_current(document):
+            self.check_document_size()  # The index holds the full text
+            self.search_index = DocumentIndex(document)
+        return self.search_index
+
+    def highlight_text(self):
+        search_window = tk.Toplevel(self.root)
+        search_window.title("Highlight Text")
+
+        tk.Label(search_window, text="Enter word or pattern to highlight:").pack(fill=tk.X, padx=5, pady=5)
+        pattern_entry = tk.Entry(search_window)
+        pattern_entry.pack(fill=tk.X, padx=5, pady=5)
+        regex = tk.BooleanVar()
+        match_case = tk.BooleanVar()
+        whole_word = tk.BooleanVar()
+        tk.Checkbutton(search_window, text="Regular expression", variable=regex).pack(anchor=tk.W, padx=5)
+        tk.Checkbutton(search_window, text="Match case", variable=match_case).pack(anchor=tk.W, padx=5)
+        tk.Checkbutton(search_window, text="Whole word", variable=whole_word).pack(anchor=tk.W, padx=5)
+        status = tk.Label(search_window)
+        status.pack(fill=tk.X, padx=5, pady=5)
+
+        def search(direction=0):
+            pattern = pattern_entry.get()
+            if not pattern or not self.viewer.document:
+                return
+            try:
+                self.search_hits = self.get_search_index().search(pattern, regex.get(), match_case.get(),
+                                                                  whole_word.get())
+            except re.error as e:
+                messagebox.showerror("Error", f"Invalid pattern: {e}")
+                return
+            except ValueError as e:
+                messagebox.showerror("Error", f"Cannot search: {e}")
+                return
+            status.config(text=f"{len(self.search_hits):,} matches")
+            start, end = self.viewer.rendered
+            if direction or not hits_between(self.search_hits, start, end):
+                self.jump_to_match(direction or 1)
+            else:
+                self.apply_highlight()
+
+        buttons = tk.Frame(search_window)
+        buttons.pack(pady=5)
+        tk.Button(buttons, text="Highlight All", command=search).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Previous", command=lambda: search(-1)).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Next", command=lambda: search(1)).pack(side=tk.LEFT, padx=5)
+        pattern_entry.bind('<Return>', lambda event: search())
+        pattern_entry.focus_set()
+
+    def apply_highlight(self):
+        # One tag_add call for every match inside the rendered window
+        self.text.tag_remove("highlight", "1.0", tk.END)
+        start, end = self.viewer.rendered
+        indexes = []
+        for hit_start, hit_end in hits_between(self.search_hits, start, end):
+            indexes.append(self.viewer.index(max(hit_start, start)))
+            indexes.append(self.viewer.index(min(hit_end, end)))
+        if indexes:
+            self.text.tag_add("highlight", *indexes)
+        self.text.tag_config("highlight", background="yellow")
+
+    def jump_to_match(self, direction):
+        hit = next_hit(self.search_hits, self.match_position, direction)
+        if hit is None:
+            self.apply_highlight()
+            return
+        self.match_position = hit[0]
+        start, end = self.viewer.rendered
+        if start <= hit[0] and hit[1] <= end:
+            self.apply_highlight()
+        else:
+            self.viewer.show(max(0, hit[0] - self.viewer.margin // 2))
+        self.text.see(self.viewer.index(hit[0]))
+
+    def unhighlight_text(self):
+        self.search_hits = []
+        self.text.tag_remove("highlight", "1.0", tk.END)
+
+    def select_html_elements(self):
+        element = simpledialog.askstring("Select HTML Elements", "Enter HTML element (e.g., 'p' for paragraphs):")
+        if element:
+            try:
+                element_text = "\n\n".join(parse_document(self.text_content).element_texts(element))
+                self.text_content = element_text
+                self.update_text_display()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to select HTML elements: {e}")
+
+    def auto_detect_tables(self):
+        try:
+            tables = parse_document(self.text_content).tables
+            # Prefer quote/earnings/balance-sheet style tables; fall back to every table on the page
+            tables = [table for table in tables if is_financial_table(table)] or tables
+            self.detected_tables = [table_to_dataframe(table) for table in tables]
+            tables_text = "\n\n".join([f"Table {index}:\n{frame.to_string()}"
+                                        for index, frame in enumerate(self.detected_tables, start=1)])
+            self.text_content = tables_text
+            self.update_text_display()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to auto-detect tables: {e}")
+
+    def export_tables(self):
+        if not self.detected_tables:
+            messagebox.showerror("Error", "No tables detected. Run Auto-Detect Tables first.")
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                 filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet")],
+                                                 title="Save tables as")
+        if file_path:
+            try:
+                prefix, extension = os.path.splitext(os.path.basename(file_path))
+                fmt = 'parquet' if extension.lower() == '.parquet' else 'csv'
+                paths = export_tables(self.detected_tables, os.path.dirname(file_path), fmt, prefix)
+                messagebox.showinfo("Success", f"Exported {len(paths)} tables to {os.path.dirname(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export tables: {e}")
+
+    def process_url_list(self):
+        url_file = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv")])
+        if url_file:
+            try:
+                urls = read_url_list(url_file)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to process URL list: {e}")
+                return
+            # Finished URLs are checkpointed next to the list so an interrupted batch can resume
+            self.open_batch_window(urls, url_file + '.checkpoint.jsonl')
+
+    def open_batch_window(self, urls, checkpoint_path):
+        batch_window = tk.Toplevel(self.root)
+        batch_window.title("Batch Processing Results")
+
+        progress_label = tk.Label(batch_window, text=f"0 / {len(urls)} URLs processed")
+        progress_label.pack(fill=tk.X, padx=5, pady=5)
+        progress = ttk.Progressbar(batch_window, maximum=max(len(urls), 1))
+        progress.pack(fill=tk.X, padx=5, pady=5)
+
+        columns = ("URL", "Overall Sentiment", "Compound", "Summary")
+        tree = ttk.Treeview(batch_window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        def show_row(row):
+            tree.insert("", tk.END, values=(row["URL"], row["Overall Sentiment"], row["Compound"],
+                                            row["Summary"][:200]))
+
+        def show_progress(done):
+            progress['value'] = done
+            progress_label.config(text=f"{done} / {len(urls)} URLs processed")
+
+        processor = BatchProcessor(self.get_url_scraper().process_url, checkpoint_path, fetcher=self.get_fetcher(),
+                                   on_result=lambda row: self.ui.post(show_row, row),
+                                   on_progress=lambda done, total: self.ui.update(progress, show_progress, done))
+
+        def close_batch_window():
+            processor.stop()
+            batch_window.destroy()
+
+        tk.Button(batch_window, text="Stop", command=processor.stop).pack(pady=5)
+        batch_window.protocol("WM_DELETE_WINDOW", close_batch_window)
+        threading.Thread(target=processor.run, args=(urls,), daemon=True).start()
+
+    def get_sentiment_scorer(self):
+        if self.sentiment_scorer is None:
+            self.sentiment_scorer = BatchSentimentScorer()
+        return self.sentiment_scorer
+
+    def perform_sentiment_analysis(self):
+        if not self.viewer.document:
+            messagebox.showerror("Error", "No content loaded. Please load a URL or file first.")
+            return
+
+        document = self.viewer.document
+        if document.path or self.document_too_large():
+            # Unedited files are scored as a token stream from disk, large edited documents chunk by chunk,
+            # instead of materializing the word list
+            threading.Thread(target=self.stream_document_sentiment, args=(document,), daemon=True).start()
+            return
+
+        # 1 = extremely negative ... 5 = extremely positive
+        self.word_list = parse_document(self.text_content).tokens
+        sentiment_scores = self.get_sentiment_scorer().bucket_scores(self.word_list)
+        self.show_sentiment_results(pd.Series(sentiment_scores).value_counts())
+
+    def stream_document_sentiment(self, document):
+        try:
+            if document.path:
+                totals = stream_sentiment(document.path, self.get_sentiment_scorer())
+            else:
+                totals = token_sentiment(iter_tokens(iter_document_blocks(document)), self.get_sentiment_scorer())
+            totals = pd.Series(totals)
+        except Exception as e:
+            self.ui.post(messagebox.showerror, "Error", f"Failed to analyze file: {e}")
+            return
+        if not totals.sum():
+            self.ui.post(messagebox.showerror, "Error", "No words found in file.")
+            return
+        self.ui.post(self.show_sentiment_results, totals[totals > 0].sort_values(ascending=False))
+
+    def show_sentiment_results(self, sentiment_counts):
+        # Determine overall sentiment
+        overall_sentiment = sentiment_counts.idxmax()
+
+        # Store results in history as the bucket distribution rather than one score per word
+        self.history.add_distribution(self.url_entry.get(), self.url_entry.get(),
+                                      self.viewer.document.slice(0, 200),  # Summary is the first 200 characters
+                                      sentiment_counts.to_dict(), overall_sentiment)
+
+        # Create a new window
+        sentiment_window = tk.Toplevel()
+        sentiment_window.title("Sentiment Analysis Results")
+
+        # Create text widget to display results
+        results_text = tk.Text(sentiment_window)
+        results_text.insert(tk.END, f"Sentiment Scores Distribution:\n{sentiment_counts.to_string()}\n\n")
+        results_text.insert(tk.END, f"Overall Sentiment: {overall_sentiment}\n")
+        results_text.pack()
+
+
+    def display_words(self):
+        document = self.viewer.document
+        if not document:
+            messagebox.showerror("Error", "No content loaded. Please load a URL first.")
+            return
+        try:
+            if self.document_too_large():
+                # Too big to parse as one page: words are listed a chunk at a time as the view pages
+                words = StreamingDocument('\n'.join(tokens) + '\n'
+                                          for tokens in iter_tokens(iter_document_blocks(document)))
+            else:
+                # Words of the webpage text content, from the cached single-pass parse
+                self.word_list = parse_document(self.text_content).tokens
+                words = ChunkedDocument('\n'.join(self.word_list))
+
+            # Create a new window to display the words, one page at a time
+            display_window = tk.Toplevel(self.root)
+            display_window.title("Words from URL")
+            words_view = VirtualTextView(display_window, window=self.chunk_size, wrap=tk.WORD)
+            words_view.pack(fill=tk.BOTH, expand=True)
+            words_view.set_document(words)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {e}")
+
+    def show_history(self, page_size=500):
+        history_window = tk.Toplevel()
+        history_window.title("History of Loaded URLs and Sentiment Analysis")
+
+        filter_frame = tk.Frame(history_window)
+        filter_frame.pack(fill=tk.X, padx=5, pady=5)
+        tk.Label(filter_frame, text="Ticker:").pack(side=tk.LEFT)
+        ticker_entry = tk.Entry(filter_frame, width=10)
+        ticker_entry.pack(side=tk.LEFT, padx=5)
+
+        columns = ("Time", "Ticker", "Title", "URL", "Summary", "Positive Words", "Negative Words",
+                   "Overall Sentiment", "Cluster")
+        tree = ttk.Treeview(history_window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        # Newest entries first, one page at a time straight from the store
+        state = {'rows': iter(())}
+
+        def load_more():
+            for _, entry in zip(range(page_size), state['rows']):
+                tree.insert("", tk.END, values=[entry[column] for column in columns])
+
+        def apply_filter():
+            tree.delete(*tree.get_children())
+            state['rows'] = self.history.query(ticker=ticker_entry.get().strip() or None, newest_first=True,
+                                               page_size=page_size)
+            load_more()
+
+        tk.Button(filter_frame, text="Filter", command=apply_filter).pack(side=tk.LEFT)
+        tk.Button(filter_frame, text="Load More", command=load_more).pack(side=tk.LEFT, padx=5)
+        apply_filter()
+
+        export_button = tk.Button(history_window, text="Export to CSV",
+                                  command=lambda: self.export_history(ticker_entry.get().strip() or None))
+        export_button.pack(pady=10)
+
+    def export_history(self, ticker=None):
+        if not self.history.count(ticker):
+            messagebox.showerror("Error", "No history to export.")
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                 filetypes=[("CSV files", "*.csv")],
+                                                 title="Save history as CSV")
+        if file_path:
+            rows = self.history.export_csv(file_path, ticker=ticker)
+            messagebox.showinfo("Success", f"Exported {rows} history rows to {file_path}")
+
+    def start_auto_search(self):
+        auto_search_window = tk.Toplevel(self.root)
+        auto_search_window.title("Start Automatic Search")
+
+        tk.Label(auto_search_window, text="Company Name:").pack(fill=tk.X, padx=5, pady=5)
+        company_name_entry = tk.Entry(auto_search_window)
+        company_name_entry.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(auto_search_window, text="NASDAQ Code:").pack(fill=tk.X, padx=5, pady=5)
+        nasdaq_code_entry = tk.Entry(auto_search_window)
+        nasdaq_code_entry.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(auto_search_window, text="SEO Words (comma separated):").pack(fill=tk.X, padx=5, pady=5)
+        seo_words_entry = tk.Entry(auto_search_window)
+        seo_words_entry.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(auto_search_window, text="Interval (seconds):").pack(fill=tk.X, padx=5, pady=5)
+        interval_entry = tk.Entry(auto_search_window)
+        interval_entry.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(auto_search_window, text="Duration (minutes):").pack(fill=tk.X, padx=5, pady=5)
+        duration_entry = tk.Entry(auto_search_window)
+        duration_entry.pack(fill=tk.X, padx=5, pady=5)
+
+        def start_search():
+            company = company_name_entry.get()
+            nasdaq_code = nasdaq_code_entry.get()
+            seo_words = seo_words_entry.get().split(',')
+            interval = int(interval_entry.get())
+            duration = int(duration_entry.get())
+
+            job = self.get_scheduler().add_job(company, nasdaq_code, seo_words, interval, duration)
+            self.scraper = job.scraper
+            auto_search_window.destroy()
+
+        tk.Button(auto_search_window, text="Start", command=start_search).pack(pady=10)
+
+    def visualize_sentiment(self):
+        sentiment_window = tk.Toplevel()
+        sentiment_window.title("Visualize Sentiment")
+
+        import_button = tk.Button(sentiment_window, text="Import CSV", command=self.import_csv)
+        import_button.pack(pady=10)
+
+        # Live view of the articles scored since the terminal started
+        SentimentDashboard(sentiment_window, self.analytics).pack(fill=tk.BOTH, expand=True)
+
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            threading.Thread(target=self.load_csv_aggregates, args=(file_path,), daemon=True).start()
+
+    def load_csv_aggregates(self, file_path, chunk_rows=100000):
+        required = {'Positive Words', 'Negative Words', 'Overall Sentiment'}
+        wanted = required | {'Ticker', 'Time', 'Compound'}
+        try:
+            columns = set(pd.read_csv(file_path, nrows=0).columns)
+            if not required <= columns:
+                self.ui.post(messagebox.showerror, "Error",
+                             "CSV file does not contain required columns 'Positive Words', 'Negative Words', and 'Overall Sentiment'.")
+                return
+            # Only the needed columns, a chunk at a time, folded into aggregates
+            aggregates = SentimentAggregates()
+            for chunk in pd.read_csv(file_path, usecols=sorted(columns & wanted), chunksize=chunk_rows):
+                aggregates.add_frame(chunk)
+        except Exception as e:
+            self.ui.post(messagebox.showerror, "Error", f"Failed to import CSV: {e}")
+            return
+        self.ui.post(self.show_imported_dashboard, file_path, aggregates)
+
+    def show_imported_dashboard(self, file_path, aggregates):
+        dashboard_window = tk.Toplevel()
+        dashboard_window.title(f"Sentiment - {os.path.basename(file_path)}")
+        SentimentDashboard(dashboard_window, aggregates).pack(fill=tk.BOTH, expand=True)
+
+    def display_article(self, title, link, summary, sentiment, ticker=''):
+        sentiment_str = f"Pos: {sentiment['pos']} | Neu: {sentiment['neu']} | Neg: {sentiment['neg']} | Compound: {sentiment['compound']}"
+        overall_sentiment = overall_sentiment_label(sentiment['compound'])
+
+        # The scraper has already recorded the article in the shared history store
+        positive_words, negative_words = sentiment_words(sentiment)
+        self.analytics.add(ticker or title, overall_sentiment, sentiment['compound'], count_words(positive_words),
+                           count_words(negative_words))
+        self.ui.append_text(self.log, f"Title: {title}\nLink: {link}\nSummary: {summary}\nSentiment: {sentiment_str}\nOverall Sentiment: {overall_sentiment}\n\n")
+
+    def get_scheduler(self):
+        if self.scheduler is None:
+            # All watchlist jobs share one fetch pool, HTTP session and sentiment analyzer
+            session = FinanceScraper.create_session(self.transport_stats)
+            fetcher = self.get_fetcher()
+            analyzer = self.get_scoring_pool()
+            cache = ArticleCache()
+
+            def make_scraper(company, nasdaq_code, seo_words):
+                def display(title, link, summary, sentiment):
+                    self.display_article(title, link, summary, sentiment, ticker=nasdaq_code)
+
+                return FinanceScraper(company, nasdaq_code, seo_words, display, fetcher=fetcher,
+                                      session=session, sentiment_analyzer=analyzer, cache=cache,
+                                      browser_pool=self.browser_pool, history=self.history,
+                                      identities=self.identities)
+
+            self.scheduler = WatchlistScheduler(make_scraper)
+        return self.scheduler
+
+    def get_fetcher(self):
+        if self.fetcher is None:
+            # One pool and one set of per-domain limits for the watchlist, URL loads and batches
+            self.fetcher = ConcurrentFetcher(stats=self.transport_stats)
+        return self.fetcher
+
+    def get_scoring_pool(self):
+        if self.scoring_pool is None:
+            # VADER runs in worker processes, one lexicon per process, so scraper threads don't share the GIL
+            self.scoring_pool = ScoringPool()
+        return self.scoring_pool
+
+    def get_url_scraper(self):
+        if self.scraper:
+            return self.scraper
+        if self.url_scraper is None:
+            self.url_scraper = FinanceScraper("", "", [], self.display_article, browser_pool=self.browser_pool,
+                                              history=self.history, identities=self.identities,
+                                              fetcher=self.get_fetcher(),
+                                              sentiment_analyzer=self.get_scoring_pool())
+        return self.url_scraper
+
+    def show_metrics(self):
+        metrics_window = tk.Toplevel()
+        metrics_window.title("Metrics")
+        MetricsPanel(metrics_window).pack(fill=tk.BOTH, expand=True)
+
+    def close(self):
+        # Watchlist first so no job starts fetching or scoring while the pools go away
+        if self.scheduler:
+            self.scheduler.shutdown()
+        if self.fetcher:
+            self.fetcher.shutdown(wait=False)
+        if self.scoring_pool:
+            self.scoring_pool.shutdown()
+        self.browser_pool.close()
+        self.history.close()
+
+    def stop_auto_search(self):
+        if self.scheduler and self.scheduler.jobs:
+            self.scheduler.stop_all()
+            self.scraper = None
+            log.info("Transport statistics:\n%s", self.transport_stats.summary())
+            log.info("Identity health:\n%s", self.identities.summary())
+            messagebox.showinfo("Stopped", "Automatic search stopped.")
+
+
+def run_app(metrics_port=DEFAULT_METRICS_PORT, metrics_dump=DEFAULT_DUMP_PATH, metrics_interval=60.0):
+    # Same numbers as the Metrics window, for Prometheus on localhost and as a JSON file for later reading
+    server, dumper = start_metrics(metrics_port, metrics_dump, metrics_interval)
+    root = tk.Tk()
+    app = StockScraperApp(root)
+    try:
+        root.mainloop()
+    finally:
+        app.close()
+        if dumper:
+            dumper.stop()
+        if server:
+            server.stop()
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+import requests
+
+from article_cache import ArticleCache
+from domain_filter import DomainFilter
+from history_store import HistoryStore
+from identity import IdentityManager
+from lexicon import LEXICON_DIR
+
+# Tests that build a real VADER analyzer; without the cached lexicon it would try to download it
+needs_lexicon = pytest.mark.skipif(not os.path.exists(os.path.join(LEXICON_DIR, 'sentiment', 'vader_lexicon.zip')),
+                                   reason="VADER lexicon not downloaded")
+
+ARTICLE = ("<html><body><h1>Quarterly results</h1>"
+           "<p>The company reported strong growth in cloud revenue and raised its outlook for the year.</p>"
+           "<p>Analysts said the results beat expectations across every segment.</p></body></html>")
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text='', headers=None, url=''):
+        self.status_code = status_code
+        self.url = url
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    # Answers every GET from a list of responses (the last one repeats); an exception instance is raised
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, **options):
+        self.requests.append((url, options))
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    def polarity_scores(self, text):
+        self.calls += 1
+        return {'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.6}
+
+
+class FakeFetcher:
+    # Fetches in order on the calling thread
+    def fetch_unordered(self, urls, fetch, stop_event=None):
+        for url in urls:
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield url, fetch(url)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def make_scraper(session, proxies=(), display=None, **options):
+    from scrapper import FinanceScraper
+
+    options.setdefault('cache', ArticleCache(':memory:'))
+    options.setdefault('history', HistoryStore(':memory:'))
+    options.setdefault('sentiment_analyzer', FakeAnalyzer())
+    return FinanceScraper("Example", "EXMP", [], display or (lambda *article: None), session=session,
+                          fetcher=FakeFetcher(), identities=IdentityManager(list(proxies), ['test-agent']),
+                          domain_filter=DomainFilter(None), **options)
+
+
+def connection_error():
+    return requests.ConnectionError("proxy refused")
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from analytics import COMPOUND_BINS, WORD_BINS, RunningStats, SentimentAggregates, count_words, count_words_series
+
+
+def test_count_words():
+    assert count_words('') == 0
+    assert count_words('gain') == 1
+    assert count_words('gain, beat, rise') == 3
+    assert count_words_series(pd.Series(['', None, 'a, b'])).tolist() == [0, 0, 2]
+
+
+def test_merged_batches_match_numpy():
+    values = np.random.default_rng(7).uniform(-1, 1, 1000)
+    stats = RunningStats(COMPOUND_BINS)
+    for batch in np.array_split(values, [1, 10, 11, 400]):
+        stats.add(batch)
+    assert stats.count == 1000
+    assert math.isclose(stats.mean, values.mean(), abs_tol=1e-12)
+    assert math.isclose(stats.variance, values.var(ddof=1), rel_tol=1e-12)
+
+
+def test_merge_of_two_accumulators_matches_numpy():
+    first, second = RunningStats(COMPOUND_BINS), RunningStats(COMPOUND_BINS)
+    first.add([0.9, 0.8, np.nan])
+    second.add([-0.5, 0.1, 0.2, 0.3])
+    first.merge(second)
+    combined = np.array([0.9, 0.8, -0.5, 0.1, 0.2, 0.3])
+    assert first.count == 6
+    assert math.isclose(first.mean, combined.mean())
+    assert math.isclose(first.variance, combined.var(ddof=1))
+    assert first.histogram.sum() == 6
+
+
+def test_quantiles():
+    values = np.linspace(-0.995, 0.995, 200)
+    stats = RunningStats(COMPOUND_BINS)
+    stats.add(values)
+    assert abs(stats.quantile(0.5) - np.quantile(values, 0.5)) < 0.01
+    assert abs(stats.quantile(0.9) - np.quantile(values, 0.9)) < 0.02
+    words = RunningStats(WORD_BINS, discrete=True)
+    words.add([1, 2, 2, 3, 40])
+    assert words.quantile(0.5) == 2.0
+    assert words.quantile(1.0) == 20.0  # Counts above MAX_WORDS share the last bin
+    assert math.isnan(RunningStats(COMPOUND_BINS).quantile(0.5))
+    assert math.isnan(RunningStats(COMPOUND_BINS).variance)
+
+
+def test_aggregates_by_ticker_and_day():
+    aggregates = SentimentAggregates()
+    day = 1_700_000_000
+    aggregates.add('AAA', 'Good', 0.4, 2, 0, timestamp=day)
+    aggregates.add('AAA', 'Bad', -0.2, 0, 1, timestamp=day + 86400 * 2)
+    aggregates.add('BBB', 'Good', 0.6, 1, 1, timestamp=day)
+    assert aggregates.tickers() == ['AAA', 'BBB']
+    assert aggregates.summary('AAA').count == 2
+    assert math.isclose(aggregates.summary('AAA').compound.mean, 0.1)
+    assert aggregates.summary().labels == {'Good': 2, 'Bad': 1}
+    assert aggregates.version == 3
+
+
+def test_add_frame_skips_duplicates():
+    frame = pd.DataFrame({
+        'Time': ['2024-05-01 10:00:00', '2024-05-01 11:00:00', '2024-05-02 09:00:00'],
+        'Ticker': ['AAA', 'AAA', 'AAA'],
+        'Overall Sentiment': ['Good', 'Good', 'Bad'],
+        'Compound': [0.5, 0.5, -0.3],
+        'Positive Words': ['gain, beat', 'gain, beat', ''],
+        'Negative Words': ['', '', 'loss'],
+        'Duplicate': [False, True, False],
+    })
+    aggregates = SentimentAggregates()
+    aggregates.add_frame(frame)
+    day = aggregates.summary('AAA', '2024-05-01')
+    assert day.count == 1 and day.positive_words.mean == 2.0
+    assert aggregates.summary('AAA').compound.count == 2
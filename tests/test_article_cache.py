@@ -0,0 +1,109 @@
+from article_cache import ArticleCache, normalize_url
+from fakes import ARTICLE, FakeResponse, FakeSession, make_scraper
+from metrics import CACHE_LOOKUPS
+
+URL = 'https://news.example.com/story?utm_source=feed'
+
+
+def make_stale(cache, url):
+    with cache.lock:
+        cache.conn.execute('UPDATE articles SET fetched_at = 0 WHERE url = ?', (normalize_url(url),))
+        cache.conn.commit()
+
+
+def test_normalize_url_drops_tracking_and_default_port():
+    assert normalize_url('HTTPS://News.Example.com:443/a/?b=2&utm_medium=x&a=1') == 'https://news.example.com/a?a=1&b=2'
+
+
+def test_put_keeps_sentiment_when_summary_unchanged():
+    cache = ArticleCache(':memory:')
+    cache.put(URL, "same text")
+    cache.set_sentiment(URL, {'compound': 0.5})
+    cache.put(URL, "same text", etag='"v2"')
+    entry = cache.get(URL)
+    assert entry.sentiment == {'compound': 0.5}
+    assert entry.etag == '"v2"'
+
+
+def test_put_keeps_duplicate_marker():
+    cache = ArticleCache(':memory:')
+    cache.put(URL, "wire story")
+    cache.set_sentiment(URL, {'duplicate_of': 'https://other.example.com/story'})
+    cache.put(URL, "wire story")
+    assert cache.get(URL).sentiment == {'duplicate_of': 'https://other.example.com/story'}
+
+
+def test_put_clears_sentiment_when_summary_changes():
+    cache = ArticleCache(':memory:')
+    cache.put(URL, "first version")
+    cache.set_sentiment(URL, {'compound': 0.5})
+    cache.put(URL, "corrected version")
+    assert cache.get(URL).sentiment is None
+
+
+def test_stale_unchanged_refetch_is_not_scored_again():
+    # fresh -> stale 200 with the same page -> fresh: scored and displayed exactly once
+    displayed = []
+    session = FakeSession(FakeResponse(200, ARTICLE))
+    scraper = make_scraper(session, display=lambda *article: displayed.append(article))
+
+    assert scraper.fetch_and_score(URL) is not None
+    assert scraper.fetch_and_score(URL) is None  # Fresh: not even fetched
+    assert len(session.requests) == 1
+
+    make_stale(scraper.cache, URL)
+    assert scraper.fetch_and_score(URL) is None  # Refetched, summary unchanged
+    assert len(session.requests) == 2
+    assert scraper.cache.get(URL).sentiment is not None
+
+    assert scraper.fetch_and_score(URL) is None  # Fresh again
+    assert len(session.requests) == 2
+    assert scraper.sentiment_analyzer.calls == 1
+    assert displayed == []
+
+
+def lookups():
+    return dict(CACHE_LOOKUPS.values)
+
+
+def lookup_delta(before):
+    return {key[0]: count - before.get(key, 0) for key, count in lookups().items() if count != before.get(key, 0)}
+
+
+def test_each_lookup_counted_once():
+    session = FakeSession(FakeResponse(200, ARTICLE), FakeResponse(304), FakeResponse(200, ARTICLE))
+    scraper = make_scraper(session)
+    before = lookups()
+    scraper.fetch_and_score(URL)
+    scraper.fetch_and_score(URL)
+    assert lookup_delta(before) == {'miss': 1, 'hit': 1}
+
+    make_stale(scraper.cache, URL)
+    before = lookups()
+    scraper.fetch_and_score(URL)
+    assert lookup_delta(before) == {'not_modified': 1}
+
+    make_stale(scraper.cache, URL)
+    before = lookups()
+    scraper.fetch_and_score(URL)
+    assert lookup_delta(before) == {'stale': 1}
+
+
+def test_bare_file_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = ArticleCache('cache.sqlite')
+    cache.put(URL, "text")
+    cache.close()
+    assert (tmp_path / 'cache.sqlite').exists()
+
+
+def test_fresh_unscored_entry_is_scored_without_a_request():
+    session = FakeSession(FakeResponse(200, ARTICLE))
+    scraper = make_scraper(session)
+    scraper.cache.put(URL, "Cached summary that was never scored")
+    before = lookups()
+    summary, sentiment, _ = scraper.fetch_and_score(URL)
+    assert summary == "Cached summary that was never scored" and sentiment is not None
+    assert session.requests == []
+    assert lookup_delta(before) == {'unscored': 1}
+    assert scraper.cache.get(URL).sentiment == sentiment
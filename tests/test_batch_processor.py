@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from batch_processor import BatchProcessor, read_url_list
+from fakes import FakeFetcher
+
+URLS = ['https://a.example.com/1', 'https://b.example.com/2', 'https://c.example.com/3']
+
+
+def process(url):
+    return {'URL': url, 'Summary': 'text', 'Compound': 0.1, 'Overall Sentiment': 'Good'}
+
+
+class RecordingFetcher(FakeFetcher):
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+
+def test_read_url_list_drops_blanks_and_repeats(tmp_path):
+    path = tmp_path / 'urls.txt'
+    path.write_text('https://a.example.com\n\nhttps://b.example.com\nhttps://a.example.com\n')
+    assert read_url_list(str(path)) == ['https://a.example.com', 'https://b.example.com']
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / 'urls.checkpoint.jsonl'
+    checkpoint.write_text(json.dumps(process(URLS[0])) + '\n{"URL": "torn')
+    processed = []
+    results = []
+
+    def track(url):
+        processed.append(url)
+        return process(url)
+
+    processor = BatchProcessor(track, str(checkpoint), fetcher=FakeFetcher(), on_result=results.append)
+    assert processor.run(URLS) == 3
+    assert processed == URLS[1:]
+    assert [row['URL'] for row in results] == URLS
+
+
+def test_shared_fetcher_is_left_running(tmp_path):
+    fetcher = RecordingFetcher()
+    BatchProcessor(process, str(tmp_path / 'c.jsonl'), fetcher=fetcher).run(URLS)
+    assert not fetcher.shut_down
+
+
+def test_owned_fetcher_is_shut_down(tmp_path):
+    processor = BatchProcessor(process, str(tmp_path / 'c.jsonl'))
+    processor.run([])
+    assert processor.owns_fetcher
+    with pytest.raises(RuntimeError):
+        processor.fetcher.executor.submit(print)
+
+
+def test_checkpoint_closed_when_a_callback_fails(tmp_path):
+    def fail(row):
+        raise RuntimeError("display went away")
+
+    processor = BatchProcessor(process, str(tmp_path / 'c.jsonl'), fetcher=FakeFetcher(), on_result=fail)
+    with pytest.raises(RuntimeError):
+        processor.run(URLS)
+    assert processor.checkpoint.file.closed
+    assert len((tmp_path / 'c.jsonl').read_text().splitlines()) == 1
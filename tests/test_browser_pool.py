@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+
+from browser_pool import BrowserPool, StaticDriver, fetch_page_source
+from fakes import ARTICLE, FakeResponse, FakeSession
+from transport import RetryLater
+
+URL = 'https://news.example.com/story'
+
+
+class CrashingDriver(StaticDriver):
+    def get(self, url):
+        raise ConnectionError("chrome not reachable")
+
+
+class Factory:
+    # Builds StaticDrivers (or the given class) and keeps every driver it handed out
+    def __init__(self, driver_class=StaticDriver):
+        self.driver_class = driver_class
+        self.drivers = []
+
+    def __call__(self):
+        driver = self.driver_class(lambda url: ARTICLE)
+        self.drivers.append(driver)
+        return driver
+
+
+def make_pool(factory=None, **options):
+    return BrowserPool(factory or Factory(), **options)
+
+
+def test_checkout_and_return_reuses_driver():
+    factory = Factory()
+    pool = make_pool(factory, size=2)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is not second
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(factory.drivers) == 2
+    pool.close()
+
+
+def test_exhausted_pool_times_out():
+    pool = make_pool(size=1, timeout=0.05)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+
+def test_waiter_gets_released_driver():
+    pool = make_pool(size=1, timeout=2)
+    driver = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (driver,))
+    timer.start()
+    assert pool.acquire() is driver
+    timer.join()
+
+
+def test_driver_recycled_after_max_pages():
+    factory = Factory()
+    pool = make_pool(factory, size=1, max_pages=2)
+    assert pool.fetch(URL) == ARTICLE
+    assert pool.fetch(URL) == ARTICLE
+    assert factory.drivers[0].closed
+    pool.fetch(URL)
+    assert len(factory.drivers) == 2 and not factory.drivers[1].closed
+
+
+def test_crashed_driver_is_replaced():
+    factory = Factory(CrashingDriver)
+    pool = make_pool(factory, size=1, timeout=0.05)
+    with pytest.raises(ConnectionError):
+        pool.fetch(URL)
+    assert factory.drivers[0].closed
+    factory.driver_class = StaticDriver
+    assert pool.fetch(URL) == ARTICLE  # No TimeoutError: the crashed driver's slot was freed
+    assert len(factory.drivers) == 2
+
+
+def test_close_quits_idle_and_returned_drivers():
+    pool = make_pool(size=2)
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.closed and not busy.closed
+    pool.release(busy)
+    assert busy.closed
+
+
+def test_fetch_page_source_skips_browser_for_plain_pages():
+    factory = Factory()
+    assert fetch_page_source(URL, FakeSession(FakeResponse(200, ARTICLE)), make_pool(factory)) == ARTICLE
+    assert factory.drivers == []
+
+
+def test_fetch_page_source_uses_browser_for_javascript_pages():
+    factory = Factory()
+    shell = '<html><body><div id="root"></div><p>Please enable JavaScript</p></body></html>'
+    assert fetch_page_source(URL, FakeSession(FakeResponse(200, shell)), make_pool(factory)) == ARTICLE
+    assert len(factory.drivers) == 1
+
+
+def test_fetch_page_source_does_not_use_browser_when_rate_limited():
+    factory = Factory()
+    session = FakeSession(FakeResponse(429, headers={'Retry-After': '30'}, url=URL))
+    with pytest.raises(RetryLater) as raised:
+        fetch_page_source(URL, session, make_pool(factory))
+    assert raised.value.retry_after == 30
+    assert factory.drivers == []
+
+
+def test_drivers_launch_outside_the_lock():
+    launching = threading.Event()
+    finish = threading.Event()
+    factory = Factory()
+
+    def slow_factory():
+        if not launching.is_set():
+            launching.set()
+            finish.wait(2)
+        return factory()
+
+    pool = make_pool(slow_factory, size=2, timeout=0.5)
+    first = []
+    thread = threading.Thread(target=lambda: first.append(pool.acquire()))
+    thread.start()
+    assert launching.wait(2)
+    second = pool.acquire()  # Not stuck behind the first launch
+    assert not first
+    finish.set()
+    thread.join()
+    assert first[0] is not second and len(factory.drivers) == 2
+
+
+def test_failed_launch_frees_its_slot():
+    factory = Factory()
+    failures = [RuntimeError("chromedriver missing")]
+
+    def flaky_factory():
+        if failures:
+            raise failures.pop()
+        return factory()
+
+    pool = make_pool(flaky_factory, size=1, timeout=0.05)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.acquire() is factory.drivers[0]
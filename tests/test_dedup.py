@@ -0,0 +1,68 @@
+from dedup import MinHasher, NearDuplicateIndex, shingles, similarity
+
+STORY = ("Shares of Example Corp rose sharply on Tuesday after the company reported quarterly revenue "
+         "well above analyst estimates and raised its full year guidance citing strong demand for its "
+         "cloud software and a recovery in hardware sales across Europe and Asia")
+REWRITE = STORY.replace("Tuesday", "Wednesday").replace("sharply", "strongly")
+OTHER = ("The central bank held interest rates steady for a third meeting while signalling that inflation "
+         "remains too high and that further tightening could not be ruled out before the end of the year")
+
+
+def jaccard(first, second):
+    first, second = shingles(first), shingles(second)
+    return len(first & second) / len(first | second)
+
+
+def test_short_texts_have_no_shingles():
+    assert shingles("Too short to fingerprint") == set()
+    assert MinHasher().signature("Too short to fingerprint") is None
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(permutations=256)
+    assert similarity(hasher.signature(STORY), hasher.signature(STORY)) == 1.0
+    estimate = similarity(hasher.signature(STORY), hasher.signature(REWRITE))
+    assert abs(estimate - jaccard(STORY, REWRITE)) < 0.1
+    assert similarity(hasher.signature(STORY), hasher.signature(OTHER)) < 0.1
+
+
+def test_signatures_are_stable_across_instances():
+    assert (MinHasher().signature(STORY) == MinHasher().signature(STORY)).all()
+
+
+def test_index_clusters_near_duplicates():
+    index = NearDuplicateIndex()
+    cluster, original = index.check(STORY, 'https://a.example.com/story')
+    assert original is None
+    assert index.check(STORY.upper() + " ", 'https://b.example.com/copy') == (cluster, 'https://a.example.com/story')
+    other_cluster, original = index.check(OTHER, 'https://c.example.com/rates')
+    assert original is None and other_cluster != cluster
+    assert index.check("Too short", 'https://d.example.com/') == (None, None)
+    assert len(index) == 2
+
+
+def test_index_threshold_rejects_loose_matches():
+    assert jaccard(STORY, REWRITE) < 0.9
+    strict = NearDuplicateIndex(threshold=0.95)
+    strict.check(STORY, 'https://a.example.com/story')
+    assert strict.check(REWRITE, 'https://b.example.com/rewrite')[1] is None
+    loose = NearDuplicateIndex(threshold=0.5)
+    loose.check(STORY, 'https://a.example.com/story')
+    assert loose.check(REWRITE, 'https://b.example.com/rewrite')[1] == 'https://a.example.com/story'
+
+
+def test_index_forgets_entries_outside_window():
+    index = NearDuplicateIndex(window=60)
+    index.check(STORY, 'https://a.example.com/story', now=1000)
+    assert index.check(STORY, 'https://b.example.com/copy', now=1030)[1] == 'https://a.example.com/story'
+    assert index.check(STORY, 'https://c.example.com/later', now=1100)[1] is None
+    assert len(index) == 1
+    assert all(len(bucket) == 1 for bucket in index.buckets.values())
+
+
+def test_scrapers_share_an_empty_injected_index():
+    from fakes import FakeSession, make_scraper
+
+    index = NearDuplicateIndex()
+    assert not index  # Empty, hence falsy
+    assert make_scraper(FakeSession(), dedup=index).dedup is index
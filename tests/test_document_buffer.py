@@ -0,0 +1,114 @@
+from document_buffer import ChunkedDocument, MappedDocument, StreamingDocument
+from file_loader import iter_document_blocks, iter_tokens, open_document, token_sentiment
+
+
+class CountingScorer:
+    # Puts every token in the neutral bucket so totals equal the token count
+    def distribution(self, tokens):
+        return {3: len(tokens)}
+
+
+def write_text(tmp_path, text, name='large.txt'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_iter_chunks_covers_document_without_joining(tmp_path):
+    text = ''.join(f"word{i} " for i in range(20000))
+    document = MappedDocument(write_text(tmp_path, text), chunk_bytes=4096)
+    pieces = list(document.iter_chunks())
+    assert len(pieces) > 1
+    assert ''.join(pieces) == text
+    assert document._text is None
+
+
+def test_iter_chunks_loads_streaming_document_lazily():
+    source = iter(['alpha ', 'beta ', 'gamma '])
+    document = StreamingDocument(source, chunk_size=4)
+    assert ''.join(document.iter_chunks()) == 'alpha beta gamma '
+    assert document.complete
+
+
+def test_mapped_text_is_not_cached(tmp_path):
+    document = MappedDocument(write_text(tmp_path, "é" * 5000 + " end"), chunk_bytes=1000)
+    assert document.text() == "é" * 5000 + " end"
+    assert document._text is None
+
+
+def test_edit_clears_path(tmp_path):
+    path = write_text(tmp_path, "good news and bad news")
+    document = open_document(path)
+    assert document.path == path
+    document.replace_ranges([(0, 4)], "great")
+    assert document.path is None
+    assert document.text() == "great news and bad news"
+
+
+def test_document_blocks_keep_words_whole():
+    document = ChunkedDocument("alpha beta gamma delta " * 50, chunk_size=7)
+    tokens = [token for block in iter_tokens(iter_document_blocks(document)) for token in block]
+    assert tokens == ["alpha", "beta", "gamma", "delta"] * 50
+
+
+def test_token_sentiment_scores_edited_text(tmp_path):
+    document = open_document(write_text(tmp_path, "one two three"))
+    document.replace_ranges([(4, 7)], "two and a half")
+    totals = token_sentiment(iter_tokens(iter_document_blocks(document)), CountingScorer())
+    assert totals[3] == 6
+
+
+def replace_reference(text, ranges, replacement):
+    for start, end in reversed(ranges):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def test_replace_ranges_matches_string_edit_for_every_chunk_size():
+    text = "the cat sat on the mat with the other cat"
+    ranges = [(0, 3), (15, 18), (28, 31), (38, 41)]
+    for chunk_size in range(1, 12):
+        document = ChunkedDocument(text, chunk_size=chunk_size)
+        document.replace_ranges(ranges, "a")
+        assert document.text() == replace_reference(text, ranges, "a"), chunk_size
+        assert len(document) == len(document.text())
+        assert document.starts == [sum(map(len, document.chunks[:i])) for i in range(len(document.chunks))]
+
+
+def test_replace_ranges_spanning_several_chunks():
+    document = ChunkedDocument("aaaabbbbccccdddd", chunk_size=4)
+    document.replace_ranges([(2, 14)], "-")
+    assert document.text() == "aa-dd"
+    assert document.slice(1, 4) == "a-d"
+
+
+def test_replace_ranges_reuses_untouched_chunks():
+    document = ChunkedDocument("aaaabbbbcccc", chunk_size=4)
+    first, last = document.chunks[0], document.chunks[2]
+    version = document.version
+    document.replace_ranges([(5, 6)], "XYZ")
+    assert document.chunks[0] is first and document.chunks[2] is last
+    assert document.text() == "aaaabXYZbbcccc"
+    assert document.version == version + 1
+
+
+def test_replace_ranges_empty_is_a_no_op():
+    document = ChunkedDocument("unchanged", chunk_size=3)
+    version = document.version
+    document.replace_ranges([], "x")
+    assert document.version == version and document.text() == "unchanged"
+
+
+def test_replace_ranges_loads_streaming_document_first():
+    document = StreamingDocument(iter(["one two ", "three two ", "four"]), chunk_size=5)
+    document.replace_ranges([(4, 7), (14, 17)], "2")
+    assert document.complete
+    assert document.text() == "one 2 three 2 four"
+
+
+def test_replace_ranges_on_mapped_multibyte_text(tmp_path):
+    text = "naïve café " * 300
+    document = MappedDocument(write_text(tmp_path, text), chunk_bytes=64)
+    ranges = [(i * 11 + 6, i * 11 + 10) for i in range(300)]
+    document.replace_ranges(ranges, "bar")
+    assert document.text() == "naïve bar " * 300
@@ -0,0 +1,80 @@
+import json
+import multiprocessing
+import time
+
+from domain_filter import ALLOWED, BLOCKED, DomainFilter, DomainTrie, _Rule, registrable_domain
+
+
+def block_many(path, prefix, count):
+    domains = DomainFilter(path)
+    for i in range(count):
+        domains.block(f'https://{prefix}{i}.example.net/page', whole_site=False)
+
+
+def test_registrable_domain():
+    assert registrable_domain('news.bbc.co.uk') == 'bbc.co.uk'
+    assert registrable_domain('www.reuters.com') == 'reuters.com'
+    assert registrable_domain('10.0.0.1') == '10.0.0.1'
+
+
+def test_trie_most_specific_rule_wins():
+    trie = DomainTrie()
+    trie.insert('example.com', _Rule(BLOCKED))
+    trie.insert('news.example.com', _Rule(ALLOWED))
+    assert trie.match('www.example.com', 0).status == BLOCKED
+    assert trie.match('a.news.example.com', 0).status == ALLOWED
+    assert trie.match('example.org', 0) is None
+
+
+def test_block_expires_after_ttl():
+    domains = DomainFilter(None)
+    domains.block('https://www.example.com/story', ttl=60)
+    assert domains.is_blocked('https://cdn.example.com/x')
+    assert domains.trie.match('cdn.example.com', time.time() + 61) is None
+    assert domains.rules() == {}
+
+
+def test_rules_persist_across_instances(tmp_path):
+    path = str(tmp_path / 'filter.json')
+    DomainFilter(path).block('https://www.example.com/', ttl=0, reason='manual')
+    assert DomainFilter(path).rules() == {'example.com': {'status': BLOCKED, 'expires': None, 'reason': 'manual'}}
+
+
+def test_save_merges_rules_from_other_instances(tmp_path):
+    path = str(tmp_path / 'filter.json')
+    first, second = DomainFilter(path), DomainFilter(path)
+    first.block('https://one.example.com/')
+    second.block('https://two.example.org/')
+    second.remove('example.com')
+    first.allow('three.example.net')
+    assert set(json.load(open(path))) == {'example.org', 'three.example.net'}
+    assert set(first.rules()) == {'example.org', 'three.example.net'}
+
+
+def test_concurrent_processes_keep_every_rule(tmp_path):
+    path = str(tmp_path / 'filter.json')
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=block_many, args=(path, prefix, 5)) for prefix in 'abcd']
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(DomainFilter(path).rules()) == 20
+
+
+def test_allowed_domains_win_over_blocks(tmp_path):
+    path = str(tmp_path / 'filter.json')
+    DomainFilter(path).block('https://www.trusted.org/', reason='written without the greenlist')
+    domains = DomainFilter(path, allowed=['trusted.org'])
+    assert domains.status('https://www.trusted.org/') == ALLOWED
+    assert domains.block('https://news.trusted.org/story') is None
+    assert not domains.remove('trusted.org')
+    domains.block('https://other.example.com/')
+    assert set(json.load(open(path))) == {'example.com'}
+    assert DomainFilter(path, allowed=['trusted.org']).status('https://trusted.org/') == ALLOWED
+
+
+def test_bare_file_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    DomainFilter('filter.json').block('https://www.example.com/')
+    assert 'example.com' in json.load(open(tmp_path / 'filter.json'))
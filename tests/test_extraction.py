@@ -0,0 +1,58 @@
+from extraction import parse_document
+from fakes import ARTICLE
+
+
+def test_summary_joins_paragraphs_and_skips_scripts():
+    document = parse_document(ARTICLE.replace('</h1>', '</h1><script>var p = "<p>not text</p>";</script>'))
+    assert document.summary == ("The company reported strong growth in cloud revenue and raised its outlook for the "
+                                "year. Analysts said the results beat expectations across every segment.")
+    assert document.element_texts('h1') == ['Quarterly results']
+    assert 'var p' not in document.text
+    assert not document.blocked
+
+
+def test_unclosed_paragraphs_close_implicitly():
+    html = "<body><p>First <b>bold</b> point<p>Second point<div>Outside</div><ul><li>item</ul></body>"
+    assert parse_document(html).paragraphs == ["First bold point", "Second point"]
+
+
+def test_paragraph_inside_table_cell_survives_cell_boundaries():
+    html = "<p>Intro<table><tr><td><p>In cell</td></tr></table><p>After"
+    assert parse_document(html).paragraphs == ["Intro", "In cell", "After"]
+
+
+def test_entities_and_void_tags():
+    document = parse_document("<p>Profit &amp; loss<br>rose 5&nbsp;%</p><img src=x>")
+    assert document.summary == "Profit & lossrose 5\xa0%"
+
+
+def test_table_rows_and_spans():
+    html = ("<table><tr><th>Metric</th><th colspan=2>2024</th></tr>"
+            "<tr><td rowspan='2'>Revenue</td><td> 1,200 </td><td>(35)</td></tr>"
+            "<tr><td>1,250<td>-</tr><tr></tr></table>")
+    (table,) = parse_document(html).tables
+    assert [[cell.text for cell in row] for row in table.rows] == [
+        ['Metric', '2024'], ['Revenue', '1,200', '(35)'], ['1,250', '-']]
+    assert table.rows[0][1].colspan == 2 and table.rows[0][0].header
+    assert table.rows[1][0].rowspan == 2
+    assert table.html == html
+
+
+def test_unclosed_table_is_still_returned():
+    (table,) = parse_document("<table><tr><td>a<td>b").tables
+    assert [[cell.text for cell in row] for row in table.rows] == [['a', 'b']]
+
+
+def test_captcha_and_login_signals():
+    captcha = parse_document("<p>Please complete the CAPTCHA to continue</p>")
+    assert captcha.bot_detected and captcha.blocked
+    login = parse_document("<form id='login'><input name=user></form><p>Sign in</p>")
+    assert login.login_form and login.blocked and not login.bot_detected
+    hidden = parse_document("<script>loadCaptcha()</script><p>News</p>")
+    assert not hidden.blocked
+
+
+def test_tokens_and_cache():
+    html = "<p>Alpha beta, gamma.</p>"
+    assert parse_document(html).tokens == ['Alpha', 'beta', 'gamma']
+    assert parse_document(html) is parse_document(html)
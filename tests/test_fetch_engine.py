@@ -0,0 +1,135 @@
+import threading
+import time
+from email.utils import formatdate
+
+from fetch_engine import BUSY_POLL, ConcurrentFetcher, DomainLimiter, TokenBucket, url_domain
+from transport import MAX_RETRY_AFTER, RetryLater, parse_retry_after
+
+
+def test_url_domain_drops_www():
+    assert url_domain('https://WWW.Example.com/a') == 'example.com'
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=2.0, burst=2)
+    now = bucket.updated
+    assert bucket.take(now) == 0.0
+    assert bucket.take(now) == 0.0
+    assert bucket.take(now) == 0.5
+    assert bucket.take(now + 0.5) == 0.0
+
+
+def test_limiter_caps_concurrency_per_domain():
+    limiter = DomainLimiter(max_per_domain=1, rate=100, burst=10, jitter=0)
+    assert limiter.try_acquire('a.com') == 0.0
+    assert limiter.try_acquire('a.com') == BUSY_POLL
+    assert limiter.try_acquire('b.com') == 0.0
+    limiter.release('a.com')
+    assert limiter.try_acquire('a.com') == 0.0
+
+
+def test_limiter_defer_blocks_domain():
+    limiter = DomainLimiter(rate=100, burst=10, jitter=0)
+    limiter.defer('a.com', 30)
+    assert 29 < limiter.try_acquire('a.com') <= 30
+    assert limiter.try_acquire('b.com') == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(str(MAX_RETRY_AFTER * 10)) == MAX_RETRY_AFTER
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_later_is_rescheduled_until_success():
+    attempts = {}
+
+    def fetch(url):
+        attempts[url] = attempts.get(url, 0) + 1
+        if attempts[url] < 3:
+            raise RetryLater(url, 503, retry_after=0.01)
+        return url.upper()
+
+    fetcher = ConcurrentFetcher(max_workers=2, rate=1000, burst=10, jitter=0)
+    try:
+        results = dict(fetcher.fetch_unordered(['https://a.com/1', 'https://b.com/2'], fetch))
+    finally:
+        fetcher.shutdown()
+    assert results == {'https://a.com/1': 'HTTPS://A.COM/1', 'https://b.com/2': 'HTTPS://B.COM/2'}
+    assert attempts == {'https://a.com/1': 3, 'https://b.com/2': 3}
+
+
+def test_gives_up_after_max_retries_and_skips_failures():
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        if url.endswith('limited'):
+            raise RetryLater(url, 429, retry_after=0)
+        if url.endswith('broken'):
+            raise ValueError("bad page")
+        return 'ok'
+
+    fetcher = ConcurrentFetcher(max_workers=2, rate=1000, burst=10, jitter=0, max_retries=2)
+    urls = ['https://a.com/limited', 'https://b.com/broken', 'https://c.com/fine']
+    try:
+        results = list(fetcher.fetch_unordered(urls, fetch))
+    finally:
+        fetcher.shutdown()
+    assert results == [('https://c.com/fine', 'ok')]
+    assert calls.count('https://a.com/limited') == 3
+    assert calls.count('https://b.com/broken') == 1
+
+
+def test_domain_concurrency_never_exceeds_cap():
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    def fetch(url):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(0.01)
+        with lock:
+            active['now'] -= 1
+        return url
+
+    fetcher = ConcurrentFetcher(max_workers=8, max_per_domain=2, rate=1000, burst=100, jitter=0)
+    urls = [f'https://a.com/{i}' for i in range(12)]
+    try:
+        assert sorted(url for url, _ in fetcher.fetch_unordered(urls, fetch)) == sorted(urls)
+    finally:
+        fetcher.shutdown()
+    assert active['peak'] == 2
+
+
+def test_stop_event_ends_wait_behind_retry_after():
+    stop = threading.Event()
+
+    def fetch(url):
+        raise RetryLater(url, 503, retry_after=MAX_RETRY_AFTER)
+
+    fetcher = ConcurrentFetcher(max_workers=1, rate=1000, burst=10, jitter=0)
+    timer = threading.Timer(0.1, stop.set)
+    timer.start()
+    started = time.monotonic()
+    try:
+        assert list(fetcher.fetch_unordered(['https://a.com/1'], fetch, stop)) == []
+    finally:
+        fetcher.shutdown()
+    assert time.monotonic() - started < 5
+
+
+def test_stop_event_set_before_start_fetches_nothing():
+    stop = threading.Event()
+    stop.set()
+    calls = []
+    fetcher = ConcurrentFetcher(max_workers=1)
+    try:
+        assert list(fetcher.fetch_unordered(['https://a.com/1'], calls.append, stop)) == []
+    finally:
+        fetcher.shutdown()
+    assert calls == []
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from file_loader import iter_csv_text, open_document
+
+
+@pytest.mark.parametrize('content', ['a,b\n', 'a,b\n1,\n2,\n', 'name,price\nalpha,1.5\nbeta,\n'])
+def test_csv_text_matches_pandas(tmp_path, content):
+    path = tmp_path / 'data.csv'
+    path.write_text(content)
+    assert ''.join(iter_csv_text(str(path))) == pd.read_csv(path).to_string() + '\n'
+
+
+def test_csv_pages_stay_aligned(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('ticker,note\n' + ''.join(f'T{i},{"x" * (i % 3)}\n' for i in range(10)))
+    pages = list(iter_csv_text(str(path), chunk_rows=4))
+    lines = ''.join(pages).splitlines()
+    assert len(pages) == 3 and len(lines) == 11
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_open_document_streams_csv(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('a,b\n')
+    document = open_document(str(path))
+    assert not document.complete
+    assert 'Columns: [a, b]' in document.text()
@@ -0,0 +1,89 @@
+import csv
+import sqlite3
+
+from history_store import HistoryStore, pack_scores, unpack_scores
+
+SENTIMENT = {'pos': 0.4, 'neu': 0.5, 'neg': 0.1, 'compound': 0.6}
+
+
+def stored_rows(path):
+    # What another process would see on disk, bypassing the store's pending buffer
+    with sqlite3.connect(path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+
+
+def add(store, ticker='EXMP', url='https://news.example.com/a'):
+    store.add_article(ticker, 'Title', url, 'Summary', SENTIMENT, 'Good')
+
+
+def test_rows_are_buffered_until_batch_size(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    store = HistoryStore(path, batch_size=3, flush_interval=3600)
+    add(store)
+    add(store)
+    assert stored_rows(path) == 0
+    add(store)
+    assert stored_rows(path) == 3
+
+
+def test_rows_are_flushed_after_interval(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    store = HistoryStore(path, batch_size=1000, flush_interval=0)
+    add(store)
+    assert stored_rows(path) == 1
+
+
+def test_reads_and_close_flush_pending_rows(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    store = HistoryStore(path, batch_size=1000, flush_interval=3600)
+    add(store)
+    assert store.count() == 1
+    assert [entry['URL'] for entry in store.query()] == ['https://news.example.com/a']
+    add(store, url='https://news.example.com/b')
+    store.close()
+    store.close()
+    assert stored_rows(path) == 2
+
+
+def test_migrates_store_without_cluster_columns(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE history (id INTEGER PRIMARY KEY, created_at REAL, ticker TEXT, title TEXT, '
+                     'url TEXT, summary TEXT, pos REAL, neu REAL, neg REAL, compound REAL, '
+                     'overall_sentiment TEXT, scores BLOB)')
+        conn.execute("INSERT INTO history (created_at, ticker, url, compound) VALUES (1.0, 'OLD', 'https://old', 0.2)")
+    store = HistoryStore(path, batch_size=1)
+    store.add_article('NEW', 'Title', 'https://new', 'Summary', SENTIMENT, 'Good', cluster='abc', duplicate=True)
+    entries = {entry['Ticker']: entry for entry in store.query()}
+    assert (entries['OLD']['Cluster'], entries['OLD']['Duplicate']) == ('', False)
+    assert (entries['NEW']['Cluster'], entries['NEW']['Duplicate']) == ('abc', True)
+    HistoryStore(path).close()  # Opening an already migrated store is a no-op
+
+
+def test_export_csv_filters_by_ticker_and_since(tmp_path):
+    store = HistoryStore(':memory:')
+    for created_at, ticker in ((100.0, 'AAA'), (200.0, 'AAA'), (300.0, 'BBB')):
+        add(store, ticker=ticker, url=f'https://news.example.com/{ticker}/{created_at:.0f}')
+    store.flush()
+    store.conn.execute('UPDATE history SET created_at = CAST(substr(url, -3) AS REAL)')
+    path = tmp_path / 'export.csv'
+    assert store.export_csv(str(path), ticker='AAA', since=150) == 1
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['URL'] for row in rows] == ['https://news.example.com/AAA/200']
+    assert store.export_csv(str(path), since=150) == 2
+
+
+def test_distribution_round_trips():
+    store = HistoryStore(':memory:')
+    store.add_distribution('file.txt', 'file.txt', '', {1: 2, 3: 40, 5: 7}, 3)
+    entry = next(store.query())
+    assert entry['Sentiment Scores'] == '{"1": 2, "2": 0, "3": 40, "4": 0, "5": 7}'
+    assert unpack_scores(pack_scores({2: 9})) == {1: 0, 2: 9, 3: 0, 4: 0, 5: 0}
+
+
+def test_bare_file_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = HistoryStore('history.sqlite')
+    store.close()
+    assert (tmp_path / 'history.sqlite').exists()
@@ -0,0 +1,81 @@
+import pytest
+
+from fakes import ARTICLE, FakeResponse, FakeSession, connection_error, make_scraper
+from identity import BLOCKED, FAILURE, SUCCESS, IdentityPool
+from transport import RetryLater
+
+PROXY = 'http://proxy.example.com:8080'
+URL = 'https://news.example.com/story'
+
+
+def proxy_stats(scraper):
+    return scraper.identities.stats()['proxies'][0]
+
+
+def fetch(scraper):
+    try:
+        return scraper.fetch_article(URL)
+    except RetryLater:
+        return None
+
+
+def test_pool_quarantines_after_consecutive_failures():
+    pool = IdentityPool(['a', 'b'], quarantine_after=2, base_quarantine=30)
+    pool.record('a', FAILURE, 1.0)
+    pool.record('a', FAILURE, 1.0)
+    assert {pool.choose() for _ in range(50)} == {'b'}
+
+
+def test_pool_success_resets_failure_streak():
+    pool = IdentityPool(['a'], quarantine_after=2)
+    pool.record('a', FAILURE)
+    pool.record('a', SUCCESS, 0.1)
+    pool.record('a', FAILURE)
+    assert pool.stats()[0]['quarantined_for'] == 0
+
+
+def test_pool_blocked_counts_toward_captcha_rate():
+    pool = IdentityPool(['a'], quarantine_blocked=False)
+    pool.record('a', BLOCKED, 0.2)
+    stats = pool.stats()[0]
+    assert stats['captchas'] == 1 and stats['captcha_rate'] > 0 and stats['quarantined_for'] == 0
+
+
+def test_407_from_proxy_leads_to_quarantine():
+    scraper = make_scraper(FakeSession(FakeResponse(407)), proxies=[PROXY])
+    fetch(scraper)
+    fetch(scraper)
+    stats = proxy_stats(scraper)
+    assert stats['failures'] == 2
+    assert stats['quarantined_for'] > 0
+
+
+def test_origin_outage_keeps_proxy_live():
+    scraper = make_scraper(FakeSession(FakeResponse(503, url=URL)), proxies=[PROXY])
+    for _ in range(5):
+        fetch(scraper)
+    stats = proxy_stats(scraper)
+    assert stats['failures'] == 0
+    assert stats['quarantined_for'] == 0
+
+
+def test_404_does_not_reset_failure_streak():
+    session = FakeSession(FakeResponse(407), FakeResponse(404), FakeResponse(407))
+    scraper = make_scraper(session, proxies=[PROXY])
+    for _ in range(3):
+        fetch(scraper)
+    assert proxy_stats(scraper)['quarantined_for'] > 0
+
+
+def test_connection_error_counts_as_failure():
+    scraper = make_scraper(FakeSession(connection_error()), proxies=[PROXY])
+    assert scraper.fetch_article(URL) == (None, False)
+    assert proxy_stats(scraper)['failures'] == 1
+
+
+@pytest.mark.parametrize('status', [200, 304])
+def test_success_statuses(status):
+    scraper = make_scraper(FakeSession(FakeResponse(status, ARTICLE)), proxies=[PROXY])
+    fetch(scraper)
+    stats = proxy_stats(scraper)
+    assert stats['requests'] == 1 and stats['failures'] == 0
@@ -0,0 +1,81 @@
+import json
+import urllib.request
+
+from metrics import Histogram, MetricsDumper, MetricsRegistry, MetricsServer
+
+
+def make_histogram():
+    histogram = Histogram('jlt_test_seconds', "Test latency", ('domain',), buckets=(1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3):
+        histogram.observe(value, 'a.com')
+    return histogram
+
+
+def test_quantile_interpolates_inside_bucket():
+    histogram = make_histogram()
+    ((_, cumulative, total, count),) = histogram.samples()
+    assert cumulative == [1, 3, 4, 4] and total == 6.5 and count == 4
+    assert histogram.quantile(0.25, cumulative) == 1.0
+    assert histogram.quantile(0.5, cumulative) == 1.5
+    assert histogram.quantile(1.0, cumulative) == 4.0
+    assert histogram.quantile(0.5, [0, 0, 0, 0]) is None
+
+
+def test_quantile_in_inf_bucket_reports_top_bound():
+    histogram = Histogram('jlt_test_slow', "Slow", buckets=(1, 2))
+    histogram.observe(30)
+    ((_, cumulative, _, _),) = histogram.samples()
+    assert histogram.quantile(0.5, cumulative) == 2
+
+
+def test_render_labelled_histogram():
+    assert make_histogram().render() == [
+        '# HELP jlt_test_seconds Test latency',
+        '# TYPE jlt_test_seconds histogram',
+        'jlt_test_seconds_bucket{domain="a.com",le="1"} 1',
+        'jlt_test_seconds_bucket{domain="a.com",le="2"} 3',
+        'jlt_test_seconds_bucket{domain="a.com",le="4"} 4',
+        'jlt_test_seconds_bucket{domain="a.com",le="+Inf"} 4',
+        'jlt_test_seconds_sum{domain="a.com"} 6.5',
+        'jlt_test_seconds_count{domain="a.com"} 4',
+    ]
+
+
+def test_registry_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    counter = registry.counter('jlt_test_total', "Things", ('kind',))
+    counter.inc('say "hi"\n')
+    counter.inc('say "hi"\n', amount=2)
+    assert registry.counter('jlt_test_total', "Things", ('kind',)) is counter
+    gauge = registry.gauge('jlt_test_queue', "Queue")
+    gauge.set(5)
+    gauge.dec()
+    registry.gauge('jlt_test_live', "Live", function=lambda: 7)
+    assert registry.render() == (
+        '# HELP jlt_test_total Things\n'
+        '# TYPE jlt_test_total counter\n'
+        'jlt_test_total{kind="say \\"hi\\"\\n"} 3\n'
+        '# HELP jlt_test_queue Queue\n'
+        '# TYPE jlt_test_queue gauge\n'
+        'jlt_test_queue 4\n'
+        '# HELP jlt_test_live Live\n'
+        '# TYPE jlt_test_live gauge\n'
+        'jlt_test_live 7\n')
+
+
+def test_snapshot_server_and_dump(tmp_path):
+    registry = MetricsRegistry()
+    registry.histogram('jlt_test_seconds', "Test", buckets=(1, 2)).observe(1.5)
+    (sample,) = registry.snapshot()['metrics']['jlt_test_seconds']['samples']
+    assert sample['count'] == 1 and sample['p50'] == 1.5 and sample['buckets'] == {'1': 0, '2': 1, '+Inf': 1}
+
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        with urllib.request.urlopen(server.address) as response:
+            assert 'jlt_test_seconds_count 1' in response.read().decode('utf-8')
+    finally:
+        server.stop()
+
+    path = tmp_path / 'metrics.json'
+    MetricsDumper(str(path), registry=registry).dump()
+    assert 'jlt_test_seconds' in json.loads(path.read_text())['metrics']
@@ -0,0 +1,33 @@
+import os
+import signal
+
+from fakes import needs_lexicon
+from scoring_pool import ScoringPool, split_sentences
+
+
+def test_split_sentences():
+    assert split_sentences("Shares rose. Profit fell! Why? done") == ["Shares rose.", "Profit fell!", "Why? done"]
+
+
+@needs_lexicon
+def test_pool_uses_spawn():
+    pool = ScoringPool(workers=1)
+    try:
+        assert pool.executor._mp_context.get_start_method() == 'spawn'
+    finally:
+        pool.shutdown()
+
+
+@needs_lexicon
+def test_killed_worker_is_replaced_and_batch_resubmitted():
+    pool = ScoringPool(workers=1)
+    try:
+        assert pool.polarity_scores("great results")['compound'] > 0
+        broken = pool.executor
+        for process in list(broken._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+        assert pool.polarity_scores("terrible losses")['compound'] < 0
+        assert pool.executor is not broken
+    finally:
+        pool.shutdown()
@@ -0,0 +1,42 @@
+import math
+from types import SimpleNamespace
+
+from fakes import needs_lexicon
+from sentiment import BatchSentimentScorer
+
+
+class FakeVader:
+    # Just enough of SentimentIntensityAnalyzer for the scorer: a lexicon and the booster words
+    lexicon = {'awful': -3.0, 'bad': -2.5, 'meh': -0.5, 'fine': 0.8, 'good': 1.9, 'great': 3.1, 'very': 0.3, 'x': 2.0}
+    constants = SimpleNamespace(BOOSTER_DICT={'very': 0.293})
+
+
+def normalized(valence):
+    return round(valence / math.sqrt(valence * valence + 15), 4)
+
+
+def test_compound_scores_use_normalized_valence():
+    scorer = BatchSentimentScorer(FakeVader())
+    scores = scorer.compound_scores(['Great', 'unknown', 'very', 'x', 'bad'])
+    assert scores.tolist() == [normalized(3.1), 0.0, 0.0, 0.0, normalized(-2.5)]
+    assert scorer.compound_scores([]).tolist() == []
+
+
+def test_bucket_edges():
+    scorer = BatchSentimentScorer(FakeVader())
+    # awful -0.61, bad -0.54, meh -0.13, unknown 0, fine 0.2, good 0.44, great 0.62
+    tokens = ['awful', 'bad', 'meh', 'zzz', 'fine', 'good', 'great']
+    assert scorer.bucket_scores(tokens).tolist() == [1, 2, 3, 3, 4, 4, 5]
+    assert scorer.distribution(tokens) == {1: 1, 2: 1, 3: 2, 4: 2, 5: 1}
+
+
+@needs_lexicon
+def test_matches_per_word_vader():
+    from lexicon import make_analyzer
+
+    analyzer = make_analyzer()
+    scorer = BatchSentimentScorer(analyzer)
+    words = ['good', 'terrible', 'profit', 'loss', 'the', 'growth', 'crisis', 'very', 'not', 'LOVE', 'a', ':)']
+    compound = scorer.compound_scores(words)
+    for word, score in zip(words, compound):
+        assert score == analyzer.polarity_scores(word)['compound'], word
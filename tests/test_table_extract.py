@@ -0,0 +1,34 @@
+import importlib.util
+import math
+import os
+
+import pytest
+
+import table_extract
+from table_extract import parse_number
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('-2.6%', -0.026),
+    ('0.07%', 0.0007),
+    ('12.5%', 0.125),
+    ('(1,234)', -1234.0),
+    ('$2.5B', 2.5e9),
+    ('1.1bn', 1.1e9),
+    ('−$3.3M', -3.3e6),
+    ('.5k', 500.0),
+])
+def test_parse_number_matches_written_value(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_number_missing_and_text():
+    assert math.isnan(parse_number('N/A'))
+    assert math.isnan(parse_number('—'))
+    assert parse_number('Revenue') is None
+
+
+def test_repo_does_not_shadow_pytables():
+    # pandas' HDF support imports PyTables as "tables"; the repo root is on sys.path during tests
+    spec = importlib.util.find_spec('tables')
+    assert spec is None or os.path.dirname(spec.origin) != os.path.dirname(table_extract.__file__)
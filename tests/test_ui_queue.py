@@ -0,0 +1,101 @@
+import threading
+
+import tkinter as tk
+
+from ui_queue import UIEventBus
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+
+class FakeLog:
+    # Bounded log widgets expose append(), so no Tk calls are made
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def append(self, text):
+        self.calls.append((self.name, text))
+
+
+def from_worker(action):
+    thread = threading.Thread(target=action)
+    thread.start()
+    thread.join()
+
+
+def make_bus(**options):
+    bus = UIEventBus(FakeRoot(), **options)
+    bus.start()
+    return bus
+
+
+def test_text_is_coalesced_per_widget_without_reordering_callbacks():
+    calls = []
+    first, second = FakeLog('first', calls), FakeLog('second', calls)
+    bus = make_bus()
+
+    def work():
+        bus.append_text(first, 'a')
+        bus.append_text(first, 'b')
+        bus.post(calls.append, 'callback')
+        bus.append_text(second, 'c')
+        bus.append_text(first, 'd')
+        bus.append_text(second, 'e')
+
+    from_worker(work)
+    bus._drain()
+    assert calls == [('first', 'ab'), 'callback', ('second', 'ce'), ('first', 'd')]
+    assert len(bus.root.scheduled) == 2  # start() and the drain reschedule
+
+
+def test_only_latest_update_per_key_is_applied():
+    calls = []
+    bus = make_bus()
+
+    def work():
+        for done in range(100):
+            bus.update('progress', calls.append, ('progress', done))
+        bus.update('status', calls.append, ('status', 'ok'))
+
+    from_worker(work)
+    bus._drain()
+    assert calls == [('progress', 99), ('status', 'ok')]
+    bus._drain()
+    assert len(calls) == 2
+
+
+def test_drain_is_bounded_per_frame():
+    calls = []
+    bus = make_bus(max_batch=3)
+    from_worker(lambda: [bus.post(calls.append, i) for i in range(5)])
+    bus._drain()
+    assert calls == [0, 1, 2]
+    bus._drain()
+    assert calls == [0, 1, 2, 3, 4]
+
+
+def test_main_thread_posts_run_immediately_and_closed_windows_are_ignored():
+    calls = []
+    bus = make_bus()
+    bus.post(calls.append, 'now')
+    assert calls == ['now']
+
+    def closed_window():
+        raise tk.TclError('invalid command name ".!text"')
+
+    from_worker(lambda: (bus.post(closed_window), bus.post(calls.append, 'next')))
+    bus._drain()
+    assert calls == ['now', 'next']
+
+
+def test_stopped_bus_does_not_reschedule():
+    bus = make_bus()
+    bus.stop()
+    bus._drain()
+    assert len(bus.root.scheduled) == 1
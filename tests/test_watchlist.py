@@ -0,0 +1,92 @@
+import heapq
+import threading
+import time
+
+from watchlist import WatchJob, WatchlistScheduler
+
+
+class FakeScraper:
+    def __init__(self, nasdaq_code, calls):
+        self.nasdaq_code = nasdaq_code
+        self.stop_event = threading.Event()
+        self.calls = calls
+
+    def scrape_google_search(self):
+        self.calls.append(self.nasdaq_code)
+
+
+def make_scheduler(calls, max_workers=1):
+    return WatchlistScheduler(lambda company, code, words: FakeScraper(code, calls), max_workers=max_workers)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_zero_duration_is_not_forever():
+    assert WatchJob(FakeScraper('A', []), 60, duration=0).expired()
+    assert not WatchJob(FakeScraper('A', []), 60).expired()
+
+
+def test_jobs_run_in_due_order():
+    calls = []
+    scheduler = make_scheduler(calls)
+    try:
+        with scheduler.condition:
+            jobs = [scheduler.add_job(code, code, [], interval=60) for code in 'ABC']
+            now = time.time()
+            for job, delay in zip(jobs, (0.2, 0.0, 0.1)):
+                job.next_due = now + delay
+            scheduler.queue = [(job.next_due, job.priority, n, job) for n, job in enumerate(jobs)]
+            heapq.heapify(scheduler.queue)
+        assert wait_for(lambda: len(calls) == 3)
+        assert calls == ['B', 'C', 'A']
+    finally:
+        scheduler.shutdown()
+
+
+def test_job_repeats_until_stopped():
+    calls = []
+    scheduler = make_scheduler(calls)
+    try:
+        job = scheduler.add_job('A', 'A', [], interval=0.01)
+        assert wait_for(lambda: len(calls) >= 3)
+        scheduler.stop_all()
+        assert job.scraper.stop_event.is_set()
+        assert wait_for(lambda: not job.running)
+        count = len(calls)
+        time.sleep(0.1)
+        assert len(calls) == count
+        assert scheduler.jobs == {}
+    finally:
+        scheduler.shutdown()
+
+
+def test_replacing_a_job_stops_the_old_one():
+    calls = []
+    scheduler = make_scheduler(calls)
+    try:
+        old = scheduler.add_job('A', 'A', [], interval=60)
+        new = scheduler.add_job('A', 'A', [], interval=60)
+        assert old.scraper.stop_event.is_set()
+        assert scheduler.jobs == {'A': new}
+    finally:
+        scheduler.shutdown()
+
+
+def test_expired_jobs_are_dropped():
+    calls = []
+    scheduler = make_scheduler(calls)
+    try:
+        scheduler.add_job('ONCE', 'ONCE', [], interval=0.01, duration=0)
+        scheduler.add_job('SOON', 'SOON', [], interval=0.01, duration=0.1 / 60)
+        assert wait_for(lambda: not scheduler.jobs)
+        assert calls.count('ONCE') == 1
+        assert calls.count('SOON') > 1
+    finally:
+        scheduler.shutdown()
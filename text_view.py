@@ -0,0 +1,91 @@
+import tkinter as tk
+from collections import deque
+from tkinter import scrolledtext
+
+from document_buffer import ChunkedDocument
+
+
+class VirtualTextView:
+    def __init__(self, parent, window=5000, margin=2000, **text_options):
+        self.window = window
+        self.margin = margin
+        self.document = ChunkedDocument()
+        self.position = 0
+        self.rendered = (0, 0)
+        self.on_render = None  # Called after each render so tags like highlights can be re-applied
+
+        self.frame = tk.Frame(parent)
+        self.text = scrolledtext.ScrolledText(self.frame, **text_options)
+        self.text.config(state=tk.DISABLED)
+        nav = tk.Frame(self.frame)
+        nav.pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(nav, text="< Prev", command=lambda: self.page(-1)).pack(side=tk.LEFT)
+        tk.Button(nav, text="Next >", command=lambda: self.page(1)).pack(side=tk.LEFT)
+        self.status = tk.Label(nav, anchor=tk.W)
+        self.status.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self.text.bind('<Prior>', lambda event: self.page(-1))
+        self.text.bind('<Next>', lambda event: self.page(1))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_document(self, document, position=0):
+        self.document = document
+        self.show(position)
+
+    def show(self, position):
+        self.document.ensure(max(position, 0) + self.window + self.margin)
+        self.position = max(0, min(position, max(len(self.document) - 1, 0)))
+        self.render()
+
+    def page(self, direction):
+        self.show(self.position + direction * self.window)
+        return 'break'
+
+    def index(self, offset):
+        # Text widget index for a document offset inside the rendered range
+        return f"1.0+{offset - self.rendered[0]}c"
+
+    def render(self):
+        # Only the current window plus a margin on each side lives in the widget
+        start = max(0, self.position - self.margin)
+        end = min(len(self.document), self.position + self.window + self.margin)
+        self.rendered = (start, end)
+        self.text.config(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.insert(tk.END, self.document.slice(start, end))
+        self.text.config(state=tk.DISABLED)
+        self.text.yview(self.index(self.position))
+        self.status.config(text=f"Characters {self.position:,}-{min(self.position + self.window, len(self.document)):,}"
+                                f" of {len(self.document):,}{'' if self.document.complete else '+'}")
+        if self.on_render:
+            self.on_render()
+
+
+class RingBufferLog:
+    def __init__(self, parent, max_chars=200000, **text_options):
+        self.max_chars = max_chars
+        self.pieces = deque()
+        self.size = 0
+        self.text = scrolledtext.ScrolledText(parent, **text_options)
+        self.text.config(state=tk.DISABLED)
+
+    def pack(self, **options):
+        self.text.pack(**options)
+
+    def append(self, text):
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, text)
+        self.pieces.append(len(text))
+        self.size += len(text)
+        # Drop the oldest output so the widget stays bounded however long auto-search runs
+        dropped = 0
+        while self.size > self.max_chars and len(self.pieces) > 1:
+            length = self.pieces.popleft()
+            self.size -= length
+            dropped += length
+        if dropped:
+            self.text.delete('1.0', f"1.0+{dropped}c")
+        self.text.config(state=tk.DISABLED)
+        self.text.see(tk.END)
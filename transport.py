@@ -0,0 +1,126 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 600  # Never park a URL longer than this, whatever the server asks for
+
+
+class RetryLater(Exception):
+    # Raised by fetch functions so the fetcher can reschedule the URL instead of sleeping in a worker
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(f"HTTP {status} for {url}" + (f", retry after {retry_after:.0f}s" if retry_after else ''))
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def raise_for_retry(response):
+    if response.status_code in RETRY_STATUSES:
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        response.close()
+        raise RetryLater(response.url, response.status_code, retry_after)
+
+
+def pool_host(key):
+    # Same shape as fetch_engine.url_domain so pool counts line up with the limiter's domains
+    host = key.key_host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if key.key_port and key.key_port != {'http': 80, 'https': 443}.get(key.key_scheme):
+        host = f"{host}:{key.key_port}"
+    return host
+
+
+class TransportStats:
+    # Throttling and retry counts per domain, plus keep-alive reuse read from the adapters' connection pools
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.adapters = []
+        self.throttled = {}
+        self.retries = {}
+        self.retry_wait = {}
+
+    def add_adapter(self, adapter):
+        with self.lock:
+            self.adapters.append(adapter)
+
+    def record_retry(self, domain, delay):
+        with self.lock:
+            self.retries[domain] = self.retries.get(domain, 0) + 1
+            self.retry_wait[domain] = self.retry_wait.get(domain, 0.0) + delay
+
+    def record_throttle(self, domain):
+        with self.lock:
+            self.throttled[domain] = self.throttled.get(domain, 0) + 1
+
+    def report(self):
+        hosts = {}
+        with self.lock:
+            adapters = list(self.adapters)
+            for domain in set(self.retries) | set(self.throttled):
+                hosts[domain] = {'requests': 0, 'connections': 0, 'throttled': self.throttled.get(domain, 0),
+                                 'retries': self.retries.get(domain, 0),
+                                 'retry_wait': round(self.retry_wait.get(domain, 0.0), 1)}
+        for adapter in adapters:
+            for host, requests_made, connections in adapter.pool_counts():
+                entry = hosts.setdefault(host, {'requests': 0, 'connections': 0, 'throttled': 0, 'retries': 0,
+                                                'retry_wait': 0.0})
+                entry['requests'] += requests_made
+                entry['connections'] += connections
+        for entry in hosts.values():
+            reused = max(entry['requests'] - entry['connections'], 0)
+            entry['reuse_rate'] = round(reused / entry['requests'], 3) if entry['requests'] else 0.0
+        return hosts
+
+    def summary(self):
+        lines = [f"{'Host':40} {'Requests':>8} {'Conns':>6} {'Reuse':>6} {'Throttled':>9} {'Retries':>7}"]
+        for host, entry in sorted(self.report().items(), key=lambda item: -item[1]['requests']):
+            lines.append(f"{host[:40]:40} {entry['requests']:>8} {entry['connections']:>6} "
+                         f"{entry['reuse_rate']:>6.0%} {entry['throttled']:>9} {entry['retries']:>7}")
+        return '\n'.join(lines)
+
+
+class TransportAdapter(HTTPAdapter):
+    def pool_counts(self):
+        # urllib3 counts every request and every new connection per pool; the difference is keep-alive reuse
+        managers = [self.poolmanager] + list(self.proxy_manager.values())
+        counts = []
+        for manager in managers:
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    counts.append((pool_host(key), pool.num_requests, pool.num_connections))
+        return counts
+
+
+def create_session(pool_connections=50, pool_maxsize=4, connect_retries=2, stats=None):
+    # pool_connections = hosts kept warm, pool_maxsize = keep-alive connections per host.
+    # Only connection failures are retried inline (without backoff); HTTP status retries are
+    # rescheduled by the fetcher through RetryLater so no worker sleeps.
+    session = requests.Session()
+    retries = Retry(total=connect_retries, connect=connect_retries, read=0, status=0,
+                    backoff_factor=0, respect_retry_after_header=False)
+    adapter = TransportAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.stats = stats or TransportStats()
+    session.stats.add_adapter(adapter)
+    return session
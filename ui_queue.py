@@ -0,0 +1,102 @@
+import logging
+import queue
+import threading
+
+import tkinter as tk
+
+from metrics import UI_QUEUE
+
+log = logging.getLogger(__name__)
+
+
+class UIEventBus:
+    def __init__(self, root, interval=50, max_pending=2000, max_batch=500):
+        self.root = root
+        self.interval = interval
+        self.max_batch = max_batch
+        self.events = queue.Queue(maxsize=max_pending)
+        self.latest = {}
+        self.latest_lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.root.after(self.interval, self._drain)
+
+    def stop(self):
+        self.running = False
+
+    def post(self, callback, *args):
+        if threading.current_thread() is threading.main_thread():
+            callback(*args)
+            return
+        # Blocks the producer while the queue is full so workers cannot outrun the UI
+        self.events.put((callback, args))
+
+    def append_text(self, widget, text):
+        self.post(_TextInsert(widget), text)
+
+    def update(self, key, callback, *args):
+        # Only the most recent update per key is applied each frame
+        with self.latest_lock:
+            self.latest[key] = (callback, args)
+
+    def _drain(self):
+        if not self.running:
+            return
+        UI_QUEUE.set(self.events.qsize())
+        pending_text = {}
+        order = []
+        for _ in range(self.max_batch):
+            try:
+                callback, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(callback, _TextInsert):
+                if callback.widget not in pending_text:
+                    pending_text[callback.widget] = []
+                    order.append(callback.widget)
+                pending_text[callback.widget].append(args[0])
+                continue
+            # Keep ordering: flush coalesced text before running any other callback
+            self._flush_text(order, pending_text)
+            self._run(callback, args)
+        self._flush_text(order, pending_text)
+
+        with self.latest_lock:
+            latest, self.latest = self.latest, {}
+        for callback, args in latest.values():
+            self._run(callback, args)
+
+        self.root.after(self.interval, self._drain)
+
+    def _flush_text(self, order, pending_text):
+        for widget in order:
+            self._run(_insert_text, (widget, ''.join(pending_text[widget])))
+        order.clear()
+        pending_text.clear()
+
+    def _run(self, callback, args):
+        try:
+            callback(*args)
+        except tk.TclError:
+            pass  # The target window was closed before the update arrived
+        except Exception as e:
+            log.exception("UI update failed: %s", e)
+
+
+class _TextInsert:
+    def __init__(self, widget):
+        self.widget = widget
+
+    def __call__(self, text):
+        _insert_text(self.widget, text)
+
+
+def _insert_text(widget, text):
+    if hasattr(widget, 'append'):
+        widget.append(text)  # Bounded logs manage their own widget
+        return
+    widget.config(state=tk.NORMAL)
+    widget.insert(tk.END, text)
+    widget.config(state=tk.DISABLED)
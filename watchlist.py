@@ -0,0 +1,117 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+class WatchJob:
+    def __init__(self, scraper, interval, duration=None, priority=0):
+        self.scraper = scraper
+        self.interval = interval
+        self.priority = priority
+        self.end_time = time.time() + duration * 60 if duration is not None else None
+        self.next_due = time.time()
+        self.running = False
+        self.runs = 0
+        self.stop_event = scraper.stop_event
+
+    @property
+    def key(self):
+        return self.scraper.nasdaq_code
+
+    def expired(self):
+        return self.end_time is not None and time.time() >= self.end_time
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class WatchlistScheduler:
+    def __init__(self, scraper_factory, max_workers=4):
+        self.scraper_factory = scraper_factory
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='watchlist')
+        self.jobs = {}
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.dispatcher = threading.Thread(target=self._dispatch, name='watchlist-dispatcher', daemon=True)
+        self.dispatcher.start()
+
+    def add_job(self, company, nasdaq_code, seo_words, interval, duration=None, priority=0):
+        scraper = self.scraper_factory(company, nasdaq_code, seo_words)
+        job = WatchJob(scraper, interval, duration, priority)
+        with self.condition:
+            old = self.jobs.pop(job.key, None)
+            if old:
+                old.stop()
+            self.jobs[job.key] = job
+            self._push(job)
+        return job
+
+    def remove_job(self, nasdaq_code):
+        with self.condition:
+            job = self.jobs.pop(nasdaq_code, None)
+            if job:
+                job.stop()
+                self.condition.notify()
+        return job
+
+    def stop_all(self):
+        with self.condition:
+            for job in self.jobs.values():
+                job.stop()
+            self.jobs.clear()
+            self.queue.clear()
+            self.condition.notify()
+
+    def shutdown(self, wait=False):
+        self.stop_all()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _push(self, job):
+        heapq.heappush(self.queue, (job.next_due, job.priority, next(self.counter), job))
+        self.condition.notify()
+
+    def _dispatch(self):
+        with self.condition:
+            while not self.stopped:
+                if not self.queue:
+                    self.condition.wait()
+                    continue
+                next_due, _, _, job = self.queue[0]
+                delay = next_due - time.time()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                heapq.heappop(self.queue)
+                # Every job searches at least once, so duration=0 matches the CLI's "search once"
+                if job.stop_event.is_set() or (job.expired() and job.runs):
+                    if self.jobs.get(job.key) is job:
+                        del self.jobs[job.key]
+                    continue
+                job.running = True
+                self.executor.submit(self._run_job, job)
+
+    def _run_job(self, job):
+        try:
+            job.scraper.scrape_google_search()
+        except Exception as e:
+            log.exception("Watchlist job %s failed: %s", job.key, e)
+        finally:
+            with self.condition:
+                job.running = False
+                job.runs += 1
+                if job.stop_event.is_set() or job.expired():
+                    if self.jobs.get(job.key) is job:
+                        del self.jobs[job.key]
+                else:
+                    job.next_due = time.time() + job.interval
+                    self._push(job)